@@ -0,0 +1,502 @@
+from functools import cache
+from typing import Callable
+
+import numpy as np
+
+from board import _BLUE, _EMPTY, _RED, _WALL, Board, Space, _layout
+
+# Given the batch, the raw value of the player to move and a random generator, pick
+# a legal dig per board as a (K,) array of cell indices
+DigPolicy = Callable[["BoardBatch", int, np.random.Generator], np.ndarray]
+# Same, but pick a move per board as (K,) start and end cell indices, start -1 to
+# stay put. Called after the digs have been applied.
+MovePolicy = Callable[
+    ["BoardBatch", int, np.random.Generator], tuple[np.ndarray, np.ndarray]
+]
+
+
+class _BatchLayout:
+    """
+    Places one board size on a square grid of axial (q, r) positions with a border of
+    unused positions all round, flattened row by row. Every hex direction is then a
+    constant offset into the flat grid, so neighbors of a whole batch are found by
+    slicing instead of indexing, and the border stops offsets wrapping between rows.
+    """
+
+    def __init__(self, size: int):
+        layout = _layout(size)
+        radius = size - 1
+        self.width = 2 * radius + 3
+        self.length = self.width * self.width
+        self.positions = np.array(
+            [(r + radius + 1) * self.width + q + radius + 1 for q, r in layout.axial],
+            dtype=np.intp,
+        )
+        self.offsets = tuple(
+            dq + dr * self.width
+            for dq, dr in ((1, -1), (1, 0), (0, 1), (-1, 1), (-1, 0), (0, -1))
+        )
+
+
+@cache
+def _batch_layout(size: int) -> _BatchLayout:
+    return _BatchLayout(size)
+
+
+def _other(color: int) -> int:
+    return _RED if color == _BLUE else _BLUE
+
+
+def _choose(mask: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    # Uniformly random True index along the last axis, -1 where there is none
+    keys = rng.random(mask.shape)
+    keys[~mask] = -1.0
+    picks = keys.argmax(-1)
+    return np.where(mask.any(-1), picks, -1)
+
+
+class BoardBatch:
+    """
+    K boards of the same size held as one (K, cells) int8 array of raw Space values,
+    in the cell order of Board's layout. Every rules query answers for all K boards at
+    once with whole-array operations, so large numbers of random or policy-driven
+    games can be played without a Python loop per board.
+
+    All boards take their turns in lockstep: red on even turns, blue on odd ones.
+    Boards whose game has ended are left untouched by later steps.
+    """
+
+    def __init__(self, count: int, small: bool = False):
+        """
+        Create a batch of boards in the default starting state
+
+        Args:
+            count (int): Number of boards, K
+            small (bool, optional): Use the small (5-hex) board. Defaults to False.
+        """
+        start = Board(small)
+        self.size = start.size
+        self.miner_count = start.miner_count
+        self._layout = _batch_layout(self.size)
+        self.cells = np.tile(np.frombuffer(start._cells, dtype=np.int8), (count, 1))
+        self.winner = np.zeros(count, dtype=np.int8)  # Raw Space value, 0 while playing
+        self.turn = 0
+
+    @classmethod
+    def from_boards(cls, boards: list[Board], turn: int = 0) -> "BoardBatch":
+        """
+        Build a batch holding copies of existing boards
+
+        Args:
+            boards (list[Board]): Boards of the same size
+            turn (int, optional): Turns already played on every board, which decides
+                whose turn is next. Defaults to 0 (red).
+
+        Raises:
+            ValueError: The boards are not all the same size
+
+        Returns:
+            BoardBatch: The batch
+        """
+        if len({board.size for board in boards}) != 1:
+            raise ValueError("Boards in a batch must all be the same size")
+        batch = cls(0, boards[0].size == 5)
+        batch.cells = np.array(
+            [np.frombuffer(board._cells, dtype=np.int8) for board in boards]
+        )
+        batch.winner = np.zeros(len(boards), dtype=np.int8)
+        batch.turn = turn
+        return batch
+
+    def board(self, k: int) -> Board:
+        """
+        Copy one board of the batch out as a Board
+
+        Args:
+            k (int): Which board
+
+        Returns:
+            Board: An independent copy
+        """
+        board = Board.__new__(Board)
+        board.__setstate__((self.size, self.miner_count, self.cells[k].tobytes()))
+        return board
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    @property
+    def color(self) -> int:
+        """
+        Raw Space value of the player whose turn it is on every board
+        """
+        return _RED if self.turn % 2 == 0 else _BLUE
+
+    def _grid(self, cells: np.ndarray) -> np.ndarray:
+        # Spread (rows, cells) values onto the flat padded grid
+        grid = np.zeros((len(cells), self._layout.length), dtype=cells.dtype)
+        grid[:, self._layout.positions] = cells
+        return grid
+
+    def _cells_of(self, grid: np.ndarray) -> np.ndarray:
+        return grid[:, self._layout.positions]
+
+    def _neighbor_count(self, grid: np.ndarray) -> np.ndarray:
+        # Number of neighbors set in a (rows, length) grid
+        grid = grid.view(np.int8)
+        out = np.zeros_like(grid)
+        for offset in self._layout.offsets:
+            if offset > 0:
+                out[..., :-offset] += grid[..., offset:]
+            else:
+                out[..., -offset:] += grid[..., :offset]
+        return out
+
+    def _dilate(self, grid: np.ndarray) -> np.ndarray:
+        # Positions with at least one neighbor set in a (rows, length) grid
+        out = np.zeros_like(grid)
+        for offset in self._layout.offsets:
+            if offset > 0:
+                out[..., :-offset] |= grid[..., offset:]
+            else:
+                out[..., -offset:] |= grid[..., :offset]
+        return out
+
+    def _flood(self, seeds: np.ndarray, passable: np.ndarray) -> np.ndarray:
+        # Grow (rows, length) seeds through passable positions until nothing changes.
+        # The border is never passable, so floods stay on the board. Rows drop out of
+        # the working set as they settle, so a few long corridors don't keep every
+        # board in the loop.
+        reach = seeds.copy()
+        rows = np.arange(len(seeds))
+        while len(rows):
+            grown = seeds | (self._dilate(seeds) & passable)
+            changed = (grown != seeds).any(1)
+            rows, seeds, passable = rows[changed], grown[changed], passable[changed]
+            reach[rows] = seeds
+        return reach
+
+    def mineable(self, cells: np.ndarray | None = None) -> np.ndarray:
+        """
+        Find the walls that pass the neighbor-count rule on every board, ignoring
+        whether anyone can reach them
+
+        Args:
+            cells (np.ndarray | None, optional): (K, cells) array to check instead of
+                the whole batch. Defaults to None.
+
+        Returns:
+            np.ndarray: (K, cells) bool mask
+        """
+        cells = self.cells if cells is None else cells
+        return self._cells_of(self._mineable_grid(self._grid(cells)))
+
+    def _mineable_grid(self, grid: np.ndarray) -> np.ndarray:
+        # Border positions hold 0, the wall value, so they never count as open. They
+        # can come out mineable, but are dropped when converting back to cells.
+        is_open = grid != _WALL
+        open_neighbors = self._neighbor_count(is_open)
+        crowded = is_open & (open_neighbors >= 3)
+        return ~is_open & (open_neighbors <= 3) & ~self._dilate(crowded)
+
+    def walkable(self, color: int, cells: np.ndarray | None = None) -> np.ndarray:
+        """
+        Find the empty cells each board's player can walk a piece to, like
+        Board.walkable_by_player
+
+        Args:
+            color (int): Raw Space value of the player
+            cells (np.ndarray | None, optional): (K, cells) array to check instead of
+                the whole batch. Defaults to None.
+
+        Returns:
+            np.ndarray: (K, cells) bool mask
+        """
+        grid = self._grid(self.cells if cells is None else cells)
+        own = grid == color
+        empty = grid == _EMPTY
+        return self._cells_of(self._flood(own, empty | own) & empty)
+
+    def mineable_by_player(
+        self, color: int, cells: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        Find the walls each board's player can dig, like Board.mineable_by_player
+
+        Args:
+            color (int): Raw Space value of the player
+            cells (np.ndarray | None, optional): (K, cells) array to check instead of
+                the whole batch. Defaults to None.
+
+        Returns:
+            np.ndarray: (K, cells) bool mask
+        """
+        grid = self._grid(self.cells if cells is None else cells)
+        own = grid == color
+        halls = self._flood(own, own | (grid == _EMPTY))
+        return self._cells_of(self._mineable_grid(grid) & self._dilate(halls))
+
+    def dead_miners(self, color: int, cells: np.ndarray | None = None) -> np.ndarray:
+        """
+        Find the pieces of one color that clear_dead would remove: those whose
+        empty-space region touches no friend and at least two enemies
+
+        Args:
+            color (int): Raw Space value of the pieces to check
+            cells (np.ndarray | None, optional): (K, cells) array to check instead of
+                the whole batch. Defaults to None.
+
+        Returns:
+            np.ndarray: (K, cells) bool mask of dead pieces
+        """
+        cells = self.cells if cells is None else cells
+        grid = self._grid(cells)
+        # One row per piece on any board, each flooding its own region
+        boards, pieces = np.nonzero(cells == color)
+        region = np.zeros((len(boards), self._layout.length), dtype=bool)
+        region[np.arange(len(boards)), self._layout.positions[pieces]] = True
+        friends = (grid == color)[boards] & ~region
+        enemies = (grid == _other(color))[boards]
+        empty = (grid == _EMPTY)[boards]
+        dead = np.zeros(len(boards), dtype=bool)
+        rows = np.arange(len(boards))
+        while len(rows):
+            border = self._dilate(region)
+            alive = (border & friends).any(1)  # Touching a friend settles it early
+            grown = region | (border & empty)
+            settled = ~alive & (grown == region).all(1)
+            dead[rows[settled]] = (border[settled] & enemies[settled]).sum(1) >= 2
+            keep = ~alive & ~settled
+            rows, region = rows[keep], grown[keep]
+            friends, enemies, empty = friends[keep], enemies[keep], empty[keep]
+        out = np.zeros(cells.shape, dtype=bool)
+        out[boards[dead], pieces[dead]] = True
+        return out
+
+    def apply_digs(self, color: int, digs: np.ndarray, cells: np.ndarray | None = None):
+        """
+        Dig one cell on each board in place, placing a new piece for boards where the
+        player has fewer than miner_count. Does not check that the digs are legal.
+
+        Args:
+            color (int): Raw Space value of the player digging
+            digs (np.ndarray): (K,) cell indices, -1 to skip a board
+            cells (np.ndarray | None, optional): (K, cells) array to change instead of
+                the whole batch. Defaults to None.
+        """
+        cells = self.cells if cells is None else cells
+        rows = np.flatnonzero(digs >= 0)
+        full = (cells[rows] == color).sum(1) >= self.miner_count
+        cells[rows, digs[rows]] = np.where(full, _EMPTY, color)
+
+    def apply_moves(
+        self, starts: np.ndarray, ends: np.ndarray, cells: np.ndarray | None = None
+    ):
+        """
+        Move one piece on each board in place. Does not check that the moves are legal.
+
+        Args:
+            starts (np.ndarray): (K,) cell indices of the pieces, -1 to stay put
+            ends (np.ndarray): (K,) cell indices of the destinations
+            cells (np.ndarray | None, optional): (K, cells) array to change instead of
+                the whole batch. Defaults to None.
+        """
+        cells = self.cells if cells is None else cells
+        rows = np.flatnonzero(starts >= 0)
+        pieces = cells[rows, starts[rows]]
+        cells[rows, starts[rows]] = _EMPTY
+        cells[rows, ends[rows]] = pieces
+
+    def clear_dead(self, color: int, cells: np.ndarray | None = None):
+        """
+        Remove the dead pieces of one color from every board in place
+
+        Args:
+            color (int): Raw Space value of the pieces to check
+            cells (np.ndarray | None, optional): (K, cells) array to change instead of
+                the whole batch. Defaults to None.
+        """
+        cells = self.cells if cells is None else cells
+        cells[self.dead_miners(color, cells)] = _EMPTY
+
+    def evaluate(
+        self, color: int, prev_enemies: int, cells: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        Score every board for a player exactly as finished_bot.evaluate does: dig
+        options for both sides, enemies taken since prev_enemies, contacts with the
+        enemy and open sides of the player's pieces
+
+        Args:
+            color (int): Raw Space value of the player to score for
+            prev_enemies (int): Enemy pieces before the turn being scored
+            cells (np.ndarray | None, optional): (K, cells) array to score instead of
+                the whole batch. Defaults to None.
+
+        Returns:
+            np.ndarray: (K,) float64 scores
+        """
+        cells = self.cells if cells is None else cells
+        other = _other(color)
+        grid = self._grid(cells)
+        own, enemy, empty = grid == color, grid == other, grid == _EMPTY
+        mineable = self._mineable_grid(grid)
+        ours = self._cells_of(mineable & self._dilate(self._flood(own, own | empty)))
+        theirs = self._cells_of(
+            mineable & self._dilate(self._flood(enemy, enemy | empty))
+        )
+        ours, theirs = ours.sum(1), theirs.sum(1)
+        contacts = (self._neighbor_count(enemy)[own]).reshape(-1)
+        open_sides = self._neighbor_count(empty)
+        rows = np.nonzero(own)[0]
+        score = (
+            40.0 * ours
+            - 120.0 * theirs
+            + 1000.0 * (prev_enemies - enemy.sum(1))
+            + 150.0 * np.bincount(rows, contacts, len(cells))
+            + 15.0 * np.bincount(rows, open_sides[own], len(cells))
+        )
+        score[ours == 0] -= 1000000000
+        score[theirs == 0] += 1000000000
+        return score
+
+    def random_moves(
+        self, color: int, rng: np.random.Generator, cells: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Pick moves the way RandomPlayer does: a random piece, then a random empty cell
+        it can walk to, or no move if it can't walk anywhere
+
+        Args:
+            color (int): Raw Space value of the player moving
+            rng (np.random.Generator): Source of randomness
+            cells (np.ndarray | None, optional): (K, cells) array to move on instead of
+                the whole batch. Defaults to None.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (K,) start and end cell indices, -1 for
+                boards with no move
+        """
+        cells = self.cells if cells is None else cells
+        starts = _choose(cells == color, rng)
+        grid = self._grid(cells)
+        own = grid == color
+        empty = grid == _EMPTY
+        seeds = np.zeros_like(own)
+        rows = np.flatnonzero(starts >= 0)
+        seeds[rows, self._layout.positions[starts[rows]]] = True
+        ends = _choose(self._cells_of(self._flood(seeds, empty | own) & empty), rng)
+        return np.where(ends >= 0, starts, -1), ends
+
+    def step(
+        self,
+        rng: np.random.Generator,
+        dig_policy: DigPolicy | None = None,
+        move_policy: MovePolicy | None = None,
+    ):
+        """
+        Play one turn on every unfinished board: check the player can dig, dig, move
+        and clear the opponent's dead pieces. A player who can't dig loses.
+
+        Args:
+            rng (np.random.Generator): Source of randomness for the policies
+            dig_policy (DigPolicy | None, optional): Chooses the digs. Only the
+                entries for unfinished boards are used. Defaults to a uniformly random
+                legal dig.
+            move_policy (MovePolicy | None, optional): Chooses the moves. Only the
+                entries for unfinished boards are used. Defaults to random_moves.
+        """
+        color = self.color
+        active = np.flatnonzero(self.winner == 0)
+        cells = self.cells[active]
+        mineable = self.mineable_by_player(color, cells)
+        stuck = ~mineable.any(1)
+        self.winner[active[stuck]] = _other(color)
+        active, cells, mineable = active[~stuck], cells[~stuck], mineable[~stuck]
+        if dig_policy is None:
+            digs = _choose(mineable, rng)
+        else:
+            digs = dig_policy(self, color, rng)[active]
+        self.apply_digs(color, digs, cells)
+        if move_policy is None:
+            starts, ends = self.random_moves(color, rng, cells)
+        else:
+            self.cells[active] = cells
+            starts, ends = (a[active] for a in move_policy(self, color, rng))
+        self.apply_moves(starts, ends, cells)
+        self.clear_dead(_other(color), cells)
+        self.cells[active] = cells
+        self.turn += 1
+
+    def play(
+        self,
+        rng: np.random.Generator | None = None,
+        max_turns: int | None = None,
+        dig_policy: DigPolicy | None = None,
+        move_policy: MovePolicy | None = None,
+    ) -> np.ndarray:
+        """
+        Step every board until its game ends or max_turns turns have been played
+
+        Args:
+            rng (np.random.Generator | None, optional): Source of randomness. Defaults
+                to a freshly seeded generator.
+            max_turns (int | None, optional): Stop after this many turns in total.
+                Defaults to no limit.
+            dig_policy (DigPolicy | None, optional): Passed to step. Defaults to None.
+            move_policy (MovePolicy | None, optional): Passed to step. Defaults to
+                None.
+
+        Returns:
+            np.ndarray: (K,) raw Space value of each board's winner, 0 if unfinished
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        while (self.winner == 0).any() and (max_turns is None or self.turn < max_turns):
+            self.step(rng, dig_policy, move_policy)
+        return self.winner
+
+
+def random_playouts(
+    games: int, small: bool = False, seed: int | None = None
+) -> dict[Space, int]:
+    """
+    Play many random games at once and count who won
+
+    Args:
+        games (int): How many games to play
+        small (bool, optional): Play on the small board. Defaults to False.
+        seed (int | None, optional): Seed for the random generator. Defaults to None.
+
+    Returns:
+        dict[Space, int]: Number of wins per color
+    """
+    winners = BoardBatch(games, small).play(np.random.default_rng(seed))
+    return {
+        color: int((winners == color.value).sum()) for color in (Space.RED, Space.BLUE)
+    }
+
+
+@cache
+def _scorer(size: int) -> BoardBatch:
+    return BoardBatch(0, small=size == 5)
+
+
+def evaluate_positions(
+    board: Board, positions: list[bytes], color: Space, prev_enemies: int
+) -> np.ndarray:
+    """
+    Score positions with BoardBatch.evaluate, as a search.BatchEvaluator
+
+    Args:
+        board (Board): Any board of the positions' size
+        positions (list[bytes]): Raw cells of each position, in Board order
+        color (Space): The player to score for
+        prev_enemies (int): Enemy pieces before the turn being scored
+
+    Returns:
+        np.ndarray: One score per position
+    """
+    cells = np.frombuffer(b"".join(positions), dtype=np.int8)
+    return _scorer(board.size).evaluate(
+        color.value, prev_enemies, cells.reshape(len(positions), -1)
+    )
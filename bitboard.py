@@ -0,0 +1,263 @@
+from functools import cache
+
+from board import (
+    _BLUE,
+    _EMPTY,
+    _RED,
+    _WALL,
+    Board,
+    CompoundCoordinate,
+    Coordinate,
+    Space,
+    _layout,
+)
+
+# Marks padding positions in the bit-ordered cell string, never a real cell value
+_PAD = 4
+
+
+class _BitLayout:
+    """
+    Maps a board size onto bit positions in a padded rhombus, one row of width
+    2 * size per r, so every hex direction is a constant shift (±1, ±W, ±(W - 1)).
+    The spare column stops shifts from wrapping between rows.
+    """
+
+    def __init__(self, size: int):
+        layout = _layout(size)
+        radius = size - 1
+        self.width = 2 * size
+        positions = [
+            (r + radius) * self.width + (q + radius) for q, r in layout.axial
+        ]
+        self.bits: tuple[int, ...] = tuple(1 << p for p in positions)
+        self.valid = sum(self.bits)
+        self.axial_at: dict[int, Coordinate] = {
+            p: layout.axial[i] for i, p in enumerate(positions)
+        }
+        # Cells are stored row by row with contiguous q, so each row of the padded
+        # rhombus is a slice of the cell array preceded by some zero padding
+        self.rows: list[tuple[bytes, int, int]] = []
+        start = 0
+        next_position = 0
+        for i in range(1, len(positions) + 1):
+            if i == len(positions) or positions[i] != positions[i - 1] + 1:
+                gap = positions[start] - next_position
+                self.rows.append((bytes([_PAD]) * gap, start, i))
+                next_position = positions[i - 1] + 1
+                start = i
+        self.tables = {
+            value: bytes.maketrans(
+                bytes(range(_PAD + 1)),
+                b"".join(b"1" if v == value else b"0" for v in range(_PAD + 1)),
+            )
+            for value in (_WALL, _EMPTY, _RED, _BLUE)
+        }
+
+
+@cache
+def _bit_layout(size: int) -> _BitLayout:
+    return _BitLayout(size)
+
+
+class BitBoard(Board):
+    """
+    Board whose rules queries run on integer bitmasks instead of set-based flood fills.
+    Cell storage is shared with Board, so the two can be converted freely and every
+    other Board method behaves identically.
+    """
+
+    @classmethod
+    def from_board(cls, board: Board) -> "BitBoard":
+        """
+        Build a bitboard with the same contents as an existing board
+
+        Args:
+            board (Board): The board to copy
+
+        Returns:
+            BitBoard: An independent copy of the board using the bitboard rules
+        """
+        out = cls.__new__(cls)
+        out.__setstate__(board.__getstate__())
+        return out
+
+    # Masks for the current cells, indexed by raw Space value. Dropped on every write.
+    _cached_masks: tuple[int, int, int, int] | None = None
+
+    def _set(self, i: int, value: int):
+        self._cached_masks = None
+        super()._set(i, value)
+
+    def __copy__(self) -> "BitBoard":
+        out = super().__copy__()
+        out._cached_masks = self._cached_masks
+        return out
+
+    def __setstate__(self, state: tuple[int, int, bytes]):
+        self._cached_masks = None
+        super().__setstate__(state)
+
+    def _masks(self) -> tuple[int, int, int, int]:
+        """
+        One mask per Space value. Built by laying the cell array out in bit order
+        (most significant first) as a byte string, translating it to ASCII 0s and 1s
+        for each value, and parsing that in base 2.
+        """
+        if self._cached_masks is None:
+            layout = _bit_layout(self.size)
+            cells = self._cells
+            padded = b"".join(
+                [p for gap, a, b in layout.rows for p in (gap, cells[a:b])]
+            )[::-1]
+            self._cached_masks = tuple(
+                int(padded.translate(layout.tables[value]), 2)
+                for value in (_WALL, _EMPTY, _RED, _BLUE)
+            )
+        return self._cached_masks
+
+    def _dilate(self, mask: int) -> int:
+        layout = _bit_layout(self.size)
+        width = layout.width
+        return (
+            (mask << 1)
+            | (mask >> 1)
+            | (mask << width)
+            | (mask >> width)
+            | (mask << (width - 1))
+            | (mask >> (width - 1))
+        ) & layout.valid
+
+    def _flood(self, seed: int, passable: int) -> int:
+        region = seed
+        while True:
+            grown = region | (self._dilate(region) & passable)
+            if grown == region:
+                return region
+            region = grown
+
+    def _coords(self, mask: int) -> set[Coordinate]:
+        axial_at = _bit_layout(self.size).axial_at
+        out = set()
+        while mask:
+            low = mask & -mask
+            out.add(axial_at[low.bit_length() - 1])
+            mask ^= low
+        return out
+
+    def _mineable_mask(self) -> int:
+        """
+        Every wall that passes the neighbor-count rule, ignoring who can reach it.
+        Open-neighbor counts for all cells are added up at once in three bit planes.
+        """
+        layout = _bit_layout(self.size)
+        width = layout.width
+        walls = self._masks()[_WALL]
+        open_cells = layout.valid & ~walls
+        ones = twos = fours = 0
+        for shift in (1, -1, width, -width, width - 1, -(width - 1)):
+            x = (open_cells << shift if shift > 0 else open_cells >> -shift) & layout.valid
+            carry = ones & x
+            ones ^= x
+            fours ^= twos & carry
+            twos ^= carry
+        at_least_three = fours | (twos & ones)
+        return walls & ~fours & ~self._dilate(open_cells & at_least_three)
+
+    def _walkable_mask(self, player: int) -> int:
+        masks = self._masks()
+        empty, own = masks[_EMPTY], masks[player]
+        return self._flood(own, empty | own) & empty
+
+    def walkable_from_coord(self, start: CompoundCoordinate) -> set[Coordinate]:
+        i = self._index(start)
+        own = self._cells[i]
+        if own == _WALL:
+            return set()
+        masks = self._masks()
+        empty = masks[_EMPTY]
+        region = self._flood(_bit_layout(self.size).bits[i], empty | masks[own])
+        return self._coords(region & empty)
+
+    def walkable_by_player(self, player: Space) -> set[Coordinate]:
+        if player not in {Space.BLUE, Space.RED}:
+            raise ValueError("The only valid players are Space.RED and Space.BLUE")
+        return self._coords(self._walkable_mask(player.value))
+
+    def is_mineable(self, coord: CompoundCoordinate) -> bool:
+        bit = _bit_layout(self.size).bits[self._index(coord)]
+        return bool(self._mineable_mask() & bit)
+
+    def _find_mineable(self, player: int) -> set[Coordinate]:
+        halls = self._walkable_mask(player) | self._masks()[player]
+        return self._coords(self._dilate(halls) & self._mineable_mask())
+
+    def _is_dead(self, bit: int, empty: int, friends: int, enemies: int) -> bool:
+        # Same flood as _flood, but stop as soon as the pocket touches a friend
+        friends &= ~bit
+        region = bit
+        while True:
+            touching = self._dilate(region)
+            if touching & friends:
+                return False
+            grown = region | (touching & empty)
+            if grown == region:
+                return (touching & enemies).bit_count() >= 2
+            region = grown
+
+    def _is_miner_dead(self, i: int) -> bool:
+        player = self._cells[i]
+        masks = self._masks()
+        return self._is_dead(
+            _bit_layout(self.size).bits[i],
+            masks[_EMPTY],
+            masks[player],
+            masks[_RED if player == _BLUE else _BLUE],
+        )
+
+    def _dead_miners(self, color: Space) -> list[int]:
+        miners = self._indices_of(color.value)
+        if not miners:
+            return []
+        bits = _bit_layout(self.size).bits
+        masks = self._masks()
+        empty, friends = masks[_EMPTY], masks[color.value]
+        enemies = masks[_RED if color == Space.BLUE else _BLUE]
+        return [i for i in miners if self._is_dead(bits[i], empty, friends, enemies)]
+
+
+class CheckedBitBoard(BitBoard):
+    """
+    BitBoard that also runs the set-based Board rules for every query and asserts
+    that both engines agree. Slow; meant for tests and debugging the bitboard code.
+    """
+
+    def walkable_from_coord(self, start: CompoundCoordinate) -> set[Coordinate]:
+        out = super().walkable_from_coord(start)
+        assert out == Board.walkable_from_coord(self, start), start
+        return out
+
+    def walkable_by_player(self, player: Space) -> set[Coordinate]:
+        out = super().walkable_by_player(player)
+        assert out == Board.walkable_by_player(self, player), player
+        return out
+
+    def is_mineable(self, coord: CompoundCoordinate) -> bool:
+        out = super().is_mineable(coord)
+        assert out == Board.is_mineable(self, coord), coord
+        return out
+
+    def _find_mineable(self, player: int) -> set[Coordinate]:
+        out = super()._find_mineable(player)
+        assert out == Board._find_mineable(self, player), player
+        return out
+
+    def _is_miner_dead(self, i: int) -> bool:
+        out = super()._is_miner_dead(i)
+        assert out == Board._is_miner_dead(self, i), self._layout.axial[i]
+        return out
+
+    def _dead_miners(self, color: Space) -> list[int]:
+        out = super()._dead_miners(color)
+        assert out == Board._dead_miners(self, color), color
+        return out
@@ -1,10 +1,14 @@
-from copy import copy, deepcopy
+from functools import cache
 from enum import Enum
+from random import Random
+from typing import Iterator, Mapping, MutableMapping, NamedTuple, Protocol
 
 
 CompoundCoordinate = tuple[int, int] | tuple[int, int, int]
 FullCoordinate = tuple[int, int, int]
 Coordinate = tuple[int, int]
+# (cell index, previous raw value) pairs, oldest change first
+Undo = list[tuple[int, int]]
 
 
 class Space(Enum):
@@ -20,6 +24,36 @@ class Space(Enum):
     BLUE = 3
 
 
+# Raw cell values as stored in Board._cells, indexed the same way as Space
+_WALL, _EMPTY, _RED, _BLUE = (s.value for s in Space)
+_SPACES = tuple(Space)
+
+# Starting miners; the small board keeps the ones that fit on it
+_RED_MINERS = ((1, -3), (2, 1), (-3, 2), (6, -4), (-4, -2), (-2, 6))
+_BLUE_MINERS = ((-1, 3), (-2, -1), (3, -2), (-6, 4), (4, 2), (2, -6))
+
+
+class _Regions(NamedTuple):
+    """
+    The empty cells of one position split into connected regions. Walking and the
+    dead-miner rule both spread through empty cells and stop at anything else, so the
+    pieces and walls bordering a region are what those rules need to know about it.
+    """
+
+    label: list[int]  # Region of each cell, -1 for cells that aren't empty
+    members: list[list[int]]  # Empty cells of each region
+    pieces: list[set[int]]  # Pieces of either color next to each region
+    walls: list[set[int]]  # Walls next to each region
+
+
+class CellWatcher(Protocol):
+    """
+    Something kept up to date with a board's contents, see Board.watch
+    """
+
+    def cell_changed(self, board: "Board", i: int, old: int, new: int) -> None: ...
+
+
 def _hex_neighbors(coord: CompoundCoordinate) -> list[FullCoordinate]:
     if len(coord) == 2:
         q, r = coord
@@ -37,11 +71,116 @@ def _hex_neighbors(coord: CompoundCoordinate) -> list[FullCoordinate]:
     return [(q + a, r + b, s + c) for a, b, c in directions]
 
 
+class _Layout:
+    """
+    Cell ordering and neighbor tables for one board size. Built once per size
+    and shared by every Board of that size.
+    """
+
+    def __init__(self, size: int):
+        radius = size - 1
+        self.size = size
+        # Row-major order (r, then q) so indices are stable across runs
+        self.coords: tuple[FullCoordinate, ...] = tuple(
+            (q, r, -q - r)
+            for r in range(-radius, radius + 1)
+            for q in range(-radius, radius + 1)
+            if abs(-q - r) <= radius
+        )
+        self.axial: tuple[Coordinate, ...] = tuple(c[:2] for c in self.coords)
+        self.index: dict[CompoundCoordinate, int] = {}
+        for i, coord in enumerate(self.coords):
+            self.index[coord] = i
+            self.index[coord[:2]] = i
+        self.neighbors: tuple[tuple[int, ...], ...] = tuple(
+            tuple(self.index[n] for n in _hex_neighbors(c) if n in self.index)
+            for c in self.coords
+        )
+        # Cells at most two steps away, the ones whose mineability depends on a cell
+        self.nearby: tuple[tuple[int, ...], ...] = tuple(
+            tuple(
+                j
+                for j, (q, r, s) in enumerate(self.coords)
+                if max(abs(q - c[0]), abs(r - c[1]), abs(s - c[2])) <= 2
+            )
+            for c in self.coords
+        )
+        # Zobrist keys per cell and raw value. Seeded so keys match across processes
+        # and runs; walls get 0 so an all-wall board has key 0.
+        rng = Random(size)
+        self.zobrist: tuple[tuple[int, ...], ...] = tuple(
+            (0,) + tuple(rng.getrandbits(64) for _ in range(len(Space) - 1))
+            for _ in self.coords
+        )
+        # The starting position, copied by every new Board of this size
+        start = bytearray([_WALL]) * len(self.coords)
+        for miners, value in ((_RED_MINERS, _RED), (_BLUE_MINERS, _BLUE)):
+            for coord in miners:
+                if coord in self.index:
+                    start[self.index[coord]] = value
+        self.start: bytes = bytes(start)
+        self.start_key = 0
+        for i, value in enumerate(start):
+            self.start_key ^= self.zobrist[i][value]
+
+
+@cache
+def _layout(size: int) -> _Layout:
+    return _Layout(size)
+
+
+class _CellView(MutableMapping[FullCoordinate, Space]):
+    """
+    Dict-like view of a board's cells keyed by full cube coordinates,
+    kept for code that reads or writes board.cells directly.
+    """
+
+    def __init__(self, board: "Board"):
+        self._board = board
+
+    def __getitem__(self, coord: FullCoordinate) -> Space:
+        return self._board[coord]
+
+    def __setitem__(self, coord: FullCoordinate, value: Space):
+        self._board[coord] = value
+
+    def __delitem__(self, coord: FullCoordinate):
+        raise TypeError("Board cells cannot be removed")
+
+    def __iter__(self) -> Iterator[FullCoordinate]:
+        return iter(self._board._layout.coords)
+
+    def __len__(self) -> int:
+        return len(self._board._cells)
+
+    def __contains__(self, coord: object) -> bool:
+        return (
+            isinstance(coord, tuple)
+            and len(coord) == 3
+            and coord in self._board._layout.index
+        )
+
+
 class Board:
     """
     Class to represent a specific board state.
+
+    Cells are stored as raw Space values in a flat bytearray, indexed in the order
+    of the shared per-size layout, so copies are cheap and rules code can walk
+    precomputed neighbor index tables instead of hashing coordinates.
     """
 
+    # Told about every cell change, see watch(). Not copied or pickled with the board.
+    _watchers: tuple[CellWatcher, ...] = ()
+    # Region index for the current cells, built on first use. Dropped on every write.
+    _regions: _Regions | None = None
+    # Walls passing the neighbor-count rule, built on first use and then kept up to
+    # date by _set, since a dig or undo only affects cells within two steps
+    _mineable: set[int] | None = None
+    # mineable_by_player answers for the current cells by raw player value. Dropped
+    # on every write.
+    _mineable_for: dict[int, set[Coordinate]] | None = None
+
     def __init__(self, small: bool = False):
         """
         Create a new board in the default starting state
@@ -52,37 +191,72 @@ class Board:
         """
         self.size = 5 if small else 7
         self.miner_count = 3 if small else 6
-        self.cells: dict[FullCoordinate, Space] = {}
-        frontier = [(0, 0, 0)]
-        for _ in range(self.size - 1):
-            next_frontier = []
-            while frontier:
-                curr = frontier.pop()
-                for neighbor in (
-                    n for n in _hex_neighbors(curr) if n not in self.cells
-                ):
-                    self.cells[neighbor] = Space.WALL
-                    next_frontier.append(neighbor)
-            frontier = next_frontier
-        red_miners = [(1, -3), (2, 1), (-3, 2), (6, -4), (-4, -2), (-2, 6)]
-        blue_miners = [(-1, 3), (-2, -1), (3, -2), (-6, 4), (4, 2), (2, -6)]
-        for cell in red_miners:
-            if cell in self:
-                self[cell] = Space.RED
-        for cell in blue_miners:
-            if cell in self:
-                self[cell] = Space.BLUE
+        self._layout = _layout(self.size)
+        self._cells = bytearray(self._layout.start)
+        self._key = self._layout.start_key
 
     def __hash__(self) -> int:
-        return hash(frozenset(self.cells.items()))
+        return self._key
+
+    @property
+    def zobrist_key(self) -> int:
+        """
+        64-bit Zobrist key of the cell contents, updated incrementally on every change.
+        Stable across processes for a given board size. Does not include whose turn it is.
+        """
+        return self._key
+
+    def _compute_key(self) -> int:
+        zobrist = self._layout.zobrist
+        key = 0
+        for i, value in enumerate(self._cells):
+            key ^= zobrist[i][value]
+        return key
 
     def __copy__(self) -> "Board":
-        out = Board.__new__(Board)
+        out = type(self).__new__(type(self))
         out.size = self.size
         out.miner_count = self.miner_count
-        out.cells = deepcopy(self.cells)
+        out._layout = self._layout
+        out._cells = bytearray(self._cells)
+        out._key = self._key
+        out._regions = self._regions
+        out._mineable = None if self._mineable is None else set(self._mineable)
+        out._mineable_for = self._mineable_for
         return out
 
+    def __deepcopy__(self, memo: dict) -> "Board":
+        # Space values are immutable, so a copy of the cell array is already deep
+        return self.__copy__()
+
+    def __getstate__(self) -> tuple[int, int, bytes]:
+        return self.size, self.miner_count, bytes(self._cells)
+
+    def __setstate__(self, state: tuple[int, int, bytes]):
+        self.size, self.miner_count, cells = state
+        self._layout = _layout(self.size)
+        self._cells = bytearray(cells)
+        self._key = self._compute_key()
+        self._regions = self._mineable = self._mineable_for = None
+
+    @property
+    def cells(self) -> MutableMapping[FullCoordinate, Space]:
+        """
+        Dict-like view of every cell on the board, keyed by full coordinate.
+        Assigning a mapping that covers every coordinate replaces the whole board.
+        """
+        return _CellView(self)
+
+    @cells.setter
+    def cells(self, cells: Mapping[FullCoordinate, Space]):
+        index = self._layout.index
+        if len(cells) != len(self._cells) or any(
+            len(coord) != 3 or coord not in index for coord in cells
+        ):
+            raise ValueError("cells must contain exactly this board's coordinates.")
+        for coord, value in cells.items():
+            self._set(index[coord], value.value)
+
     def count_elements(self, element: Space) -> int:
         """
         Count how many of a given space exist on the board
@@ -93,7 +267,7 @@ class Board:
         Returns:
             int: The number of instances of that space on the board
         """
-        return len([c for c in self.cells.values() if c == element])
+        return self._cells.count(element.value)
 
     def _full_coordinate(self, coord: CompoundCoordinate) -> FullCoordinate:
         if len(coord) == 2:
@@ -103,6 +277,25 @@ class Board:
             q, r, s = coord
         return (q, r, s)
 
+    def _index(self, coord: CompoundCoordinate) -> int:
+        index = self._layout.index
+        try:
+            return index[coord]
+        except (KeyError, TypeError):
+            coord = self._full_coordinate(coord)
+            if coord in index:
+                return index[coord]
+            raise ValueError(f"{coord} is not a valid coordinate.") from None
+
+    def _indices_of(self, value: int) -> list[int]:
+        out = []
+        find = self._cells.find
+        i = find(value)
+        while i != -1:
+            out.append(i)
+            i = find(value, i + 1)
+        return out
+
     def __setitem__(self, coord: CompoundCoordinate, value: Space):
         """
         Replace a space on the board with different contents.
@@ -115,10 +308,7 @@ class Board:
         Raises:
             ValueError: The given coord is not a valid coordinate on this board
         """
-        coord = self._full_coordinate(coord)
-        if coord not in self.cells:
-            raise ValueError(f"{coord} is not a valid coordinate.")
-        self.cells[coord] = value
+        self._set(self._index(coord), value.value)
 
     def __getitem__(self, coord: CompoundCoordinate) -> Space:
         """
@@ -134,10 +324,7 @@ class Board:
         Returns:
             Space: The value contained at that coordinate
         """
-        coord = self._full_coordinate(coord)
-        if coord not in self.cells:
-            raise ValueError(f"{coord} is not a valid coordinate.")
-        return self.cells[coord]
+        return _SPACES[self._cells[self._index(coord)]]
 
     def __contains__(self, coord: CompoundCoordinate) -> bool:
         """
@@ -150,8 +337,7 @@ class Board:
         Returns:
             bool: True if the coordinate exists on the board, False otherwise
         """
-        coord = self._full_coordinate(coord)
-        return coord in self.cells
+        return self._full_coordinate(coord) in self._layout.index
 
     def find_all(self, space: Space) -> set[Coordinate]:
         """
@@ -163,7 +349,8 @@ class Board:
         Returns:
             set[Coordinate]: The coordinates at which the given space appears
         """
-        return {coord[:2] for coord in self.cells if self[coord] == space}
+        axial = self._layout.axial
+        return {axial[i] for i in self._indices_of(space.value)}
 
     def neighbors(
         self, coord: CompoundCoordinate, space: Space | None = None
@@ -180,11 +367,91 @@ class Board:
         Returns:
             set[Coordinate]: The coordinates of the neighbors
         """
+        layout = self._layout
+        i = layout.index.get(coord)
+        if i is None:
+            # Off-board coordinates can still border the edge of the board
+            neighbors = [
+                layout.index[n] for n in _hex_neighbors(coord) if n in layout.index
+            ]
+        else:
+            neighbors = layout.neighbors[i]
+        axial = layout.axial
         if space is None:
-            return {n[:2] for n in _hex_neighbors(coord) if n in self.cells}
-        return {
-            n[:2] for n in _hex_neighbors(coord) if n in self.cells and self[n] == space
-        }
+            return {axial[n] for n in neighbors}
+        cells = self._cells
+        value = space.value
+        return {axial[n] for n in neighbors if cells[n] == value}
+
+    def _region_index(self) -> _Regions:
+        # One pass labels every empty region, shared by all the queries on this position
+        if self._regions is None:
+            cells = self._cells
+            neighbors = self._layout.neighbors
+            label = [-1] * len(cells)
+            members: list[list[int]] = []
+            pieces: list[set[int]] = []
+            walls: list[set[int]] = []
+            for start in self._indices_of(_EMPTY):
+                if label[start] != -1:
+                    continue
+                region = len(members)
+                label[start] = region
+                found = [start]
+                touching: set[int] = set()
+                bordering: set[int] = set()
+                for curr in found:
+                    for n in neighbors[curr]:
+                        value = cells[n]
+                        if value == _EMPTY:
+                            if label[n] == -1:
+                                label[n] = region
+                                found.append(n)
+                        elif value == _WALL:
+                            bordering.add(n)
+                        else:
+                            touching.add(n)
+                members.append(found)
+                pieces.append(touching)
+                walls.append(bordering)
+            self._regions = _Regions(label, members, pieces, walls)
+        return self._regions
+
+    def _walkable_regions(self, starts: list[int]) -> set[int]:
+        # Regions reachable from the pieces at starts, stepping through friendly
+        # pieces and empty regions. All starts must hold the same color.
+        cells = self._cells
+        neighbors = self._layout.neighbors
+        regions = self._region_index()
+        label = regions.label
+        own = cells[starts[0]]
+        seen_pieces = set(starts)
+        seen_regions: set[int] = set()
+        frontier = list(starts)
+        while frontier:
+            curr = frontier.pop()
+            for n in neighbors[curr]:
+                value = cells[n]
+                if value == _EMPTY:
+                    region = label[n]
+                    if region in seen_regions:
+                        continue
+                    seen_regions.add(region)
+                    for p in regions.pieces[region]:
+                        if cells[p] == own and p not in seen_pieces:
+                            seen_pieces.add(p)
+                            frontier.append(p)
+                elif value == own and n not in seen_pieces:
+                    seen_pieces.add(n)
+                    frontier.append(n)
+        return seen_regions
+
+    def _walkable_indices(self, start: int) -> list[int]:
+        regions = self._region_index()
+        if self._cells[start] == _EMPTY:
+            return list(regions.members[regions.label[start]])
+        members = regions.members
+        return [i for r in self._walkable_regions([start]) for i in members[r]]
 
     def walkable_from_coord(self, start: CompoundCoordinate) -> set[Coordinate]:
         """
@@ -198,22 +465,11 @@ class Board:
         Returns:
             set[Coordinate]: The spaces that a piece on the starting location could walk to.
         """
-        if self[start] == Space.WALL:
+        i = self._index(start)
+        if self._cells[i] == _WALL:
             return set()
-        traversable = {self[start], Space.EMPTY}
-        out: set[Coordinate] = set()
-        frontier = set([start])
-        visited: set[Coordinate] = set()
-        while frontier:
-            curr = frontier.pop()
-            curr = curr[:2]
-            visited.add(curr)
-            if self[curr] not in traversable:
-                continue
-            if self[curr] == Space.EMPTY:
-                out.add(curr)
-            frontier |= self.neighbors(curr) - visited
-        return out
+        axial = self._layout.axial
+        return {axial[n] for n in self._walkable_indices(i)}
 
     def walkable_by_player(self, player: Space) -> set[Coordinate]:
         """
@@ -231,11 +487,29 @@ class Board:
         """
         if player not in {Space.BLUE, Space.RED}:
             raise ValueError("The only valid players are Space.RED and Space.BLUE")
-        player_coords = self.find_all(player)
-        out = set()
-        for p in player_coords:
-            out |= self.walkable_from_coord(p)
-        return out
+        pieces = self._indices_of(player.value)
+        if not pieces:
+            return set()
+        axial = self._layout.axial
+        members = self._region_index().members
+        return {axial[i] for r in self._walkable_regions(pieces) for i in members[r]}
+
+    def _is_mineable(self, i: int) -> bool:
+        cells = self._cells
+        neighbors = self._layout.neighbors
+        if cells[i] != _WALL:
+            return False
+        open_neighbors = [n for n in neighbors[i] if cells[n] != _WALL]
+        if len(open_neighbors) > 3:
+            return False
+        for n in open_neighbors:
+            count = 0
+            for m in neighbors[n]:
+                if cells[m] != _WALL:
+                    count += 1
+            if count >= 3:
+                return False
+        return True
 
     def is_mineable(self, coord: CompoundCoordinate) -> bool:
         """
@@ -247,26 +521,14 @@ class Board:
         Returns:
             bool: _description_
         """
-        if self[coord] != Space.WALL:
-            return False
-        empty_neighbors = (
-            self.neighbors(coord, Space.EMPTY)
-            | self.neighbors(coord, Space.RED)
-            | self.neighbors(coord, Space.BLUE)
-        )
-        if len(empty_neighbors) > 3:
-            return False
-        for n in empty_neighbors:
-            if (
-                len(
-                    self.neighbors(n, Space.EMPTY)
-                    | self.neighbors(n, Space.RED)
-                    | self.neighbors(n, Space.BLUE)
-                )
-                >= 3
-            ):
-                return False
-        return True
+        return self._index(coord) in self._mineable_walls()
+
+    def _mineable_walls(self) -> set[int]:
+        if self._mineable is None:
+            self._mineable = {
+                i for i in self._indices_of(_WALL) if self._is_mineable(i)
+            }
+        return self._mineable
 
     def mineable_by_player(self, player: Space) -> set[Coordinate]:
         """
@@ -283,13 +545,48 @@ class Board:
         """
         if player not in {Space.BLUE, Space.RED}:
             raise ValueError("The only valid players are Space.RED and Space.BLUE")
-        neighboring_walls = set()
-        player_coords = self.find_all(player)
-        for hall in self.walkable_by_player(player) | player_coords:
-            neighboring_walls |= {
-                w for w in self.neighbors(hall, Space.WALL) if self.is_mineable(w)
-            }
-        return neighboring_walls
+        if self._mineable_for is None:
+            self._mineable_for = {}
+        found = self._mineable_for.get(player.value)
+        if found is None:
+            found = self._mineable_for[player.value] = self._find_mineable(player.value)
+        # A copy, so callers can't change the cached answer
+        return set(found)
+
+    def _find_mineable(self, player: int) -> set[Coordinate]:
+        cells = self._cells
+        neighbors = self._layout.neighbors
+        pieces = self._indices_of(player)
+        walls = {n for p in pieces for n in neighbors[p] if cells[n] == _WALL}
+        if pieces:
+            regions = self._region_index()
+            for r in self._walkable_regions(pieces):
+                walls |= regions.walls[r]
+        axial = self._layout.axial
+        return {axial[w] for w in walls & self._mineable_walls()}
+
+    def _is_miner_dead(self, i: int) -> bool:
+        # The miner is dead if the pieces it can reach through empty cells are all
+        # enemies, and at least two of them
+        cells = self._cells
+        regions = self._region_index()
+        label = regions.label
+        player = cells[i]
+        seen: set[int] = set()
+        touching: set[int] = set()
+        for n in self._layout.neighbors[i]:
+            value = cells[n]
+            if value == _EMPTY:
+                region = label[n]
+                if region not in seen:
+                    seen.add(region)
+                    touching |= regions.pieces[region]
+            elif value != _WALL:
+                touching.add(n)
+        touching.discard(i)
+        if any(cells[p] == player for p in touching):
+            return False
+        return len(touching) >= 2
 
     def is_miner_dead(self, coord: CompoundCoordinate) -> bool:
         """
@@ -304,31 +601,176 @@ class Board:
         Returns:
             bool: True if the miner needs to be removed from the board, False otherwise
         """
-        player = self[coord]
-        if player not in {Space.BLUE, Space.RED}:
+        i = self._index(coord)
+        if self._cells[i] not in (_RED, _BLUE):
             raise ValueError("The only valid players are Space.RED and Space.BLUE")
-        other_player = Space.RED if player == Space.BLUE else Space.BLUE
-        enemy_count = 0
-        frontier = set([coord])
-        visited: set[Coordinate] = set()
-        while frontier:
-            curr = frontier.pop()
-            curr = curr[:2]
-            visited.add(curr)
-            if self[curr] == player and curr != coord[:2]:
-                return False
-            elif self[curr] == other_player:
-                enemy_count += 1
-            elif curr == coord[:2] or self[curr] == Space.EMPTY:
-                frontier |= self.neighbors(curr) - visited
-        return enemy_count >= 2
-
-    def clear_dead(self, other_color: Space):
-        dead_enemies = {
-            coord
-            for coord in self.cells
-            if self[coord] == other_color and self.is_miner_dead(coord)
-        }
-        for enemy in dead_enemies:
-            self[enemy] = Space.EMPTY
+        return self._is_miner_dead(i)
+
+    def _dead_miners(self, color: Space) -> list[int]:
+        # One sweep over the regions instead of a check per miner. Miners that meet
+        # in a region, or stand next to each other, reach a friend and live. Any
+        # other miner is alone in its pocket, so no region is looked at twice.
+        cells = self._cells
+        neighbors = self._layout.neighbors
+        player = color.value
+        miners = self._indices_of(player)
+        if not miners:
+            return []
+        regions = self._region_index()
+        alive = {i for i in miners for n in neighbors[i] if cells[n] == player}
+        for touching in regions.pieces:
+            ours = [p for p in touching if cells[p] == player]
+            if len(ours) > 1:
+                alive.update(ours)
+        label = regions.label
+        dead = []
+        for i in miners:
+            if i in alive:
+                continue
+            enemies: set[int] = set()
+            for n in neighbors[i]:
+                if cells[n] == _EMPTY:
+                    enemies |= regions.pieces[label[n]]
+                elif cells[n] != _WALL:
+                    enemies.add(n)
+            enemies.discard(i)
+            if len(enemies) >= 2:
+                dead.append(i)
+        return dead
+
+    def clear_dead(self, other_color: Space) -> list[Coordinate]:
+        """
+        Remove every dead miner of a color
+
+        Args:
+            other_color (Space): The color whose dead miners are removed
+
+        Returns:
+            list[Coordinate]: Where the removed miners were
+        """
+        dead = self._dead_miners(other_color)
+        for enemy in dead:
+            self._set(enemy, _EMPTY)
+        axial = self._layout.axial
+        return [axial[i] for i in dead]
+
+    def _set(self, i: int, value: int):
+        # Every cell write goes through here
+        old = self._cells[i]
+        keys = self._layout.zobrist[i]
+        self._key ^= keys[old] ^ keys[value]
+        self._cells[i] = value
+        self._regions = self._mineable_for = None
+        if self._mineable is not None and (old == _WALL) != (value == _WALL):
+            mineable = self._mineable
+            for n in self._layout.nearby[i]:
+                if self._is_mineable(n):
+                    mineable.add(n)
+                else:
+                    mineable.discard(n)
+        for watcher in self._watchers:
+            watcher.cell_changed(self, i, old, value)
+
+    def watch(self, watcher: CellWatcher):
+        """
+        Call watcher.cell_changed(board, index, old, new) after every change to a
+        cell, with the cell's index in the board layout and its raw values. Covers
+        item assignment, apply_*, undo and clear_dead alike.
+
+        Args:
+            watcher (CellWatcher): The object to notify
+        """
+        self._watchers = self._watchers + (watcher,)
+
+    def unwatch(self, watcher: CellWatcher):
+        """
+        Stop notifying a watcher added with watch()
+
+        Args:
+            watcher (CellWatcher): The object to stop notifying
+        """
+        self._watchers = tuple(w for w in self._watchers if w is not watcher)
+
+    def _record(self, undo: Undo, i: int, value: int):
+        undo.append((i, self._cells[i]))
+        self._set(i, value)
+
+    def apply_dig(self, coord: CompoundCoordinate, player: Space) -> Undo:
+        """
+        Dig out a space in place. The dug space gets a new miner for the player if they
+        have fewer than miner_count pieces, otherwise it becomes empty.
+        Does not check that the dig is legal.
+
+        Args:
+            coord (CompoundCoordinate): The space to dig out
+            player (Space): The player doing the digging
+
+        Returns:
+            Undo: A record that undo() can use to restore the board
+        """
+        value = (
+            _EMPTY
+            if self._cells.count(player.value) == self.miner_count
+            else player.value
+        )
+        undo: Undo = []
+        self._record(undo, self._index(coord), value)
+        return undo
+
+    def apply_move(self, start: CompoundCoordinate, end: CompoundCoordinate) -> Undo:
+        """
+        Move the piece at start to end in place. Does not check that the move is legal.
 
+        Args:
+            start (CompoundCoordinate): The location of the piece to move
+            end (CompoundCoordinate): Where the piece ends up
+
+        Returns:
+            Undo: A record that undo() can use to restore the board
+        """
+        i, j = self._index(start), self._index(end)
+        player = self._cells[i]
+        undo: Undo = []
+        self._record(undo, i, _EMPTY)
+        self._record(undo, j, player)
+        return undo
+
+    def apply_turn(
+        self,
+        player: Space,
+        dig: CompoundCoordinate | None,
+        move: tuple[CompoundCoordinate, CompoundCoordinate] | None = None,
+    ) -> Undo:
+        """
+        Play a whole turn in place: dig, optionally move, then remove dead enemies.
+        Does not check that the dig or move is legal.
+
+        Args:
+            player (Space): The player taking the turn
+            dig (CompoundCoordinate | None): The space to dig out, or None if the dig
+                has already been applied
+            move (tuple[CompoundCoordinate, CompoundCoordinate] | None, optional): The
+                start and end of the move, or None to stay put. Defaults to None.
+
+        Returns:
+            Undo: A record that undo() can use to restore the board, including any
+                enemies removed by clear_dead
+        """
+        undo = self.apply_dig(dig, player) if dig is not None else []
+        if move is not None:
+            undo += self.apply_move(*move)
+        other_color = Space.RED if player == Space.BLUE else Space.BLUE
+        for enemy in self._dead_miners(other_color):
+            self._record(undo, enemy, _EMPTY)
+        return undo
+
+    def undo(self, undo: Undo):
+        """
+        Reverse the changes made by apply_dig, apply_move or apply_turn. Records must be
+        undone in the reverse order to the one they were applied in.
+
+        Args:
+            undo (Undo): The record returned when the change was applied
+        """
+        for i, value in reversed(undo):
+            self._set(i, value)
@@ -0,0 +1,228 @@
+import argparse
+import struct
+from copy import copy
+from random import Random
+from typing import IO
+
+from batch import evaluate_positions
+from bitboard import BitBoard
+from board import Board, Space, _layout
+from search import Turn, legal_turns, other_color
+
+# Start of an opening book file, followed by a count and fixed-width entries
+MAGIC = b"HXOB1\n"
+_ENTRY = struct.Struct("<QBBBB")  # Key, board size, then the turn's cell indices
+_NO_CELL = 255  # Cell byte for a turn without a move
+
+# Mixed into board keys so each side to move and board size has its own entries
+_rng = Random("book")
+_SALTS = {
+    (size, color): _rng.getrandbits(64)
+    for size in (5, 7)
+    for color in (Space.RED, Space.BLUE)
+}
+
+
+def _key(board: Board, color: Space) -> int:
+    return board.zobrist_key ^ _SALTS[board.size, color]
+
+
+class OpeningBook:
+    """
+    Best turns for positions near the start of the game, found offline by deep
+    searches (see build()) and looked up by Zobrist key at play time
+    """
+
+    def __init__(self):
+        # Keyed by _key(); each value is the turn and the board size it belongs to
+        self.entries: dict[int, tuple[int, Turn]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, board: Board, color: Space, turn: Turn):
+        """
+        Args:
+            board (Board): The position
+            color (Space): The player to move
+            turn (Turn): The turn to play there. Its dig can't be None.
+        """
+        self.entries[_key(board, color)] = (board.size, turn)
+
+    def lookup(self, board: Board, color: Space) -> Turn | None:
+        """
+        Find the book turn for a position, checking that it is legal there so a key
+        collision can't produce an illegal turn
+
+        Args:
+            board (Board): The position. Temporarily modified.
+            color (Space): The player to move
+
+        Returns:
+            Turn | None: The turn, or None if the position isn't in the book
+        """
+        entry = self.entries.get(_key(board, color))
+        if entry is None:
+            return None
+        turn = entry[1]
+        dig, move = turn
+        if dig not in board.mineable_by_player(color):
+            return None
+        if move is None:
+            return turn
+        undo = board.apply_dig(dig, color)
+        try:
+            start, end = move
+            legal = board[start] == color and end in board.walkable_from_coord(start)
+        finally:
+            board.undo(undo)
+        return turn if legal else None
+
+    def write(self, file: IO[bytes]):
+        """
+        Save the book to a binary file opened with "wb". Entries are sorted by key,
+        so the same book always gives the same bytes.
+
+        Args:
+            file (IO[bytes]): Where to write
+        """
+        file.write(MAGIC)
+        file.write(struct.pack("<I", len(self.entries)))
+        for key, (size, (dig, move)) in sorted(self.entries.items()):
+            index = _layout(size).index
+            start, end = (
+                (index[move[0]], index[move[1]])
+                if move is not None
+                else (_NO_CELL, _NO_CELL)
+            )
+            file.write(_ENTRY.pack(key, size, index[dig], start, end))
+
+    @classmethod
+    def read(cls, file: IO[bytes]) -> "OpeningBook":
+        """
+        Args:
+            file (IO[bytes]): A file written by write(), opened with "rb"
+
+        Raises:
+            ValueError: The file isn't an opening book, or is truncated
+
+        Returns:
+            OpeningBook: The book
+        """
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not an opening book file")
+        try:
+            (count,) = struct.unpack("<I", file.read(4))
+            data = file.read(count * _ENTRY.size)
+            book = cls()
+            for key, size, dig, start, end in _ENTRY.iter_unpack(data):
+                axial = _layout(size).axial
+                move = None if start == _NO_CELL else (axial[start], axial[end])
+                book.entries[key] = (size, (axial[dig], move))
+        except (struct.error, IndexError) as e:
+            raise ValueError("Truncated opening book file") from e
+        if len(book.entries) != count:
+            raise ValueError("Truncated opening book file")
+        return book
+
+
+def load(path: str) -> OpeningBook:
+    """
+    Args:
+        path (str): A file saved with OpeningBook.write()
+
+    Returns:
+        OpeningBook: The book
+    """
+    with open(path, "rb") as file:
+        return OpeningBook.read(file)
+
+
+def _candidates(board: Board, color: Space, best: Turn, width: int) -> list[Turn]:
+    # The searched turn, then the turns that look best one turn ahead
+    turns = [turn for turn in legal_turns(board, color) if turn != best]
+    if width <= 1 or not turns:
+        return [best]
+    positions = []
+    for turn in turns:
+        undo = board.apply_turn(color, *turn)
+        positions.append(bytes(board._cells))
+        board.undo(undo)
+    scores = evaluate_positions(
+        board, positions, color, board.count_elements(other_color(color))
+    )
+    ranked = sorted(range(len(turns)), key=lambda i: -scores[i])
+    return [best] + [turns[i] for i in ranked[: width - 1]]
+
+
+def build(
+    small: bool,
+    plies: int = 4,
+    depth: int = 3,
+    width: int = 3,
+    book: OpeningBook | None = None,
+) -> OpeningBook:
+    """
+    Search the start of the game offline. Every position reached is searched to a
+    fixed depth with finished_bot, and its best turn added to the book. From each
+    position the tree continues through the best turn and the width - 1 other turns
+    that score best one turn ahead, so an opponent who strays from the book's own
+    line still meets book positions.
+
+    Args:
+        small (bool): Build for the small board
+        plies (int, optional): Turns from the start to cover. Defaults to 4.
+        depth (int, optional): Search depth per position, in turns. Defaults to 3.
+        width (int, optional): Turns followed from each position. Defaults to 3.
+        book (OpeningBook | None, optional): Book to add to, e.g. the other board
+            size's. Defaults to a new book.
+
+    Returns:
+        OpeningBook: The book
+    """
+    from finished_bot import finished_bot
+
+    if book is None:
+        book = OpeningBook()
+    bot = finished_bot(depth=depth)
+    frontier: list[tuple[Board, Space]] = [(BitBoard(small), Space.RED)]
+    seen: set[int] = set()
+    for ply in range(plies):
+        following: list[tuple[Board, Space]] = []
+        for board, color in frontier:
+            key = _key(board, color)
+            if key in seen:
+                continue  # Reached by another order of turns
+            seen.add(key)
+            turn = bot._search(board, color)
+            if turn is None or turn[0] is None:
+                continue  # The player to move has already lost
+            book.add(board, color, turn)
+            if ply + 1 < plies:
+                for child in _candidates(board, color, turn, width):
+                    after = copy(board)
+                    after.apply_turn(color, *child)
+                    following.append((after, other_color(color)))
+        frontier = following
+    return book
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build an opening book offline.")
+    parser.add_argument("book", help="file to write")
+    parser.add_argument("--size", choices=["small", "large", "both"], default="both")
+    parser.add_argument("--plies", type=int, default=4, help="turns from the start")
+    parser.add_argument("--depth", type=int, default=3, help="search depth, in turns")
+    parser.add_argument("--width", type=int, default=3, help="turns followed from each")
+    args = parser.parse_args()
+
+    book = OpeningBook()
+    for small in {"small": [True], "large": [False], "both": [True, False]}[args.size]:
+        build(small, args.plies, args.depth, args.width, book)
+    with open(args.book, "wb") as file:
+        book.write(file)
+    print(f"wrote {len(book)} positions")
+
+
+if __name__ == "__main__":
+    main()
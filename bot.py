@@ -1,5 +1,6 @@
 from board import Board, Space, Coordinate
 from copy import copy, deepcopy
+from geometry import cells, geometry, nearest_teammate
 import math
 
 class bot:
@@ -184,24 +185,14 @@ class bot:
             walking_weight += 1000 
         if len(prev_our_spaces) > len(our_spaces): 
             walking_weight -= 1000
-        for us in our_spaces: 
-            for other in other_spaces:
-                if self.distance(us, other) == 1: 
-                    walking_weight += 300
-            for walkable in board.walkable_by_player(color): 
-                if self.distance(us, walkable) == 1: 
-                    walking_weight += 300
+        geo = geometry(board.size)
+        ours = cells(board, color)
+        walking_weight += 300 * geo.count_within(ours, cells(board, other_color))
+        walking_weight += 300 * geo.count_within(ours, cells(board, Space.EMPTY))
                 
         return walking_weight + 5 * self.closest_teammate(color, board) - 3 * self.closest_teammate(other_color, board) - 100 * len(board.mineable_by_player(other_color))
 
 
-    def distance(self, start: Coordinate, dest: Coordinate) -> int:
-        q_diff = abs(start[0] - dest[0])
-        r_diff = abs(start[1] - dest[1]) 
-        s_diff = abs(-start[0]-start[1] - (-dest[0]-dest[1]))
-        return max(q_diff, r_diff, s_diff)
-        
-    
     """def closest_enemy(self, board: Board, color: Space) -> list[tuple[Coordinate, int]]: 
         out: list[tuple[Coordinate, int]] = []
         mineable_red = board.mineable_by_player(Space.RED)
@@ -243,20 +234,4 @@ class bot:
 
     
     def closest_teammate(self, color: Space, board: Board) -> float:
-        min = math.inf
-        if color == Space.RED: 
-            red_spaces = board.find_all(Space.RED) 
-            for us in red_spaces: 
-                for other in red_spaces: 
-                    current = self.distance(us, other)
-                    if current < min and current > 0: 
-                        min = current
-        else: 
-            blue_spaces = board.find_all(Space.BLUE) 
-            for us in blue_spaces: 
-                for other in blue_spaces: 
-                    current = self.distance(us, other)
-                    if current < min and current > 0: 
-                        min = current 
-
-        return min
+        return nearest_teammate(board, color)
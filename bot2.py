@@ -1,5 +1,6 @@
 from board import Board, Space, Coordinate
 from copy import deepcopy
+from geometry import cells, geometry, nearest_teammate
 import math
 
 class bot2:
@@ -111,26 +112,16 @@ class bot2:
         other_spaces = board.find_all(other_color)
         walking_weight = 1000 * (len(prev_board.find_all(other_color)) - len(other_spaces))
         
-        for us in our_spaces:
-            for other in other_spaces:
-                if self.distance(us, other) == 1:
-                    walking_weight += 150
-            for walkable in board.walkable_from_coord(us):
-                if self.distance(us, walkable) == 1:
-                    walking_weight += 15
+        geo = geometry(board.size)
+        ours = cells(board, color)
+        walking_weight += 150 * geo.count_within(ours, cells(board, other_color))
+        # Every empty neighbor can be walked to, so those are the walkable cells one step away
+        walking_weight += 15 * geo.count_within(ours, cells(board, Space.EMPTY))
         
         return walking_weight + 50 * self.closest_teammate(color, board) - 3 * self.closest_teammate(other_color, board) - 100 * len(board.mineable_by_player(other_color))
 
-    def distance(self, start: Coordinate, dest: Coordinate) -> int:
-        return max(abs(start[0] - dest[0]), abs(start[1] - dest[1]), abs(-start[0] - start[1] - (-dest[0] - dest[1])))
-
     def closest_teammate(self, color: Space, board: Board) -> float:
-        min_dist = math.inf
-        ours = board.find_all(color)
-        for us in ours:
-            for other in ours:
-                if us != other:
-                    min_dist = min(min_dist, self.distance(us, other))
+        min_dist = nearest_teammate(board, color)
         return min_dist if min_dist != math.inf else 0
 
     def mine(self, board: Board, color: Space) -> Coordinate:
@@ -1,5 +1,6 @@
 from board import Board, Space, Coordinate
 from copy import copy, deepcopy
+from geometry import cells, distance, geometry, nearest_teammate
 import math
 
 class bot3:
@@ -215,23 +216,13 @@ class bot3:
             walking_weight += 1000 
         if len(prev_our_spaces) > len(our_spaces): 
             walking_weight -= 1000
-        for us in our_spaces: 
-            for other in other_spaces:
-                if self.distance(us, other) == 1: 
-                    walking_weight += 150
-            for walkable in board.walkable_by_player(color): 
-                if self.distance(us, walkable) == 1: 
-                    walking_weight += 15
+        geo = geometry(board.size)
+        ours = cells(board, color)
+        walking_weight += 150 * geo.count_within(ours, cells(board, other_color))
+        walking_weight += 15 * geo.count_within(ours, cells(board, Space.EMPTY))
                 
         return walking_weight + 5 * self.closest_teammate(color, board) - 3 * self.closest_teammate(other_color, board) - 100 * len(board.mineable_by_player(other_color))
 
-    def distance(self, start: Coordinate, dest: Coordinate) -> int:
-        q_diff = abs(start[0] - dest[0])
-        r_diff = abs(start[1] - dest[1]) 
-        s_diff = abs(-start[0]-start[1] - (-dest[0]-dest[1]))
-        return max(q_diff, r_diff, s_diff)
-        
-    
     def closest_enemy(self, board: Board, color: Space) -> list[tuple[Coordinate, int]]: 
         out: list[tuple[Coordinate, int]] = []
         mineable_red = board.mineable_by_player(Space.RED)
@@ -241,7 +232,7 @@ class bot3:
         if color == Space.RED: #red
             for i in mineable_red:
                 for j in mineable_blue:
-                    curr_dist = self.distance(i,j)
+                    curr_dist = distance(i,j)
                     distances.add(curr_dist) 
                     coordinates.update({curr_dist: (i,j)})
             min_dist = min(distances)
@@ -253,7 +244,7 @@ class bot3:
         elif color == Space.BLUE:
             for i in mineable_blue:
                 for j in mineable_red:
-                    curr_dist = self.distance(i,j)
+                    curr_dist = distance(i,j)
                     distances.add(curr_dist) 
                     coordinates.update({curr_dist: (i,j)})
             min_dist = min(distances)
@@ -272,12 +263,4 @@ class bot3:
 
     
     def closest_teammate(self, color: Space, board: Board) -> float:
-        min = math.inf
-        ours = board.find_all(color)
-        for us in ours: 
-            for other in ours: 
-                current = self.distance(us, other)
-                if current < min and current > 0: 
-                    min = current
-
-        return min
\ No newline at end of file
+        return nearest_teammate(board, color)
\ No newline at end of file
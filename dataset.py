@@ -0,0 +1,292 @@
+import argparse
+import math
+from typing import Iterable
+
+import numpy as np
+
+from bitboard import BitBoard
+from board import Board, Space, _layout
+from game import Player
+from geometry import cells, geometry
+from records import GameRecord, _apply, read_binary
+from simulator import Simulator
+
+# Terms of finished_bot.evaluate, which scores the player who just moved on the
+# position after their turn. "captured" is the opponent's piece count before the
+# turn minus after it. The +-1e9 terms for a side left without a dig only show up
+# once the game is decided, so they aren't features.
+FEATURES = (
+    "our_mineable",
+    "their_mineable",
+    "captured",
+    "contacts",
+    "our_open_sides",
+)
+# finished_bot's weights for the same terms; its two mineable terms for the
+# opponent add up to -120
+HAND_WEIGHTS = np.array([40.0, -120.0, 1000.0, 150.0, 15.0])
+_CELLS = len(_layout(7).coords)  # Small boards are padded to the large board's width
+
+# One fixed-width row per position. Files are a plain array of rows with no header,
+# so any row can be read straight from a memory map.
+POSITION = np.dtype(
+    [
+        ("cells", np.int8, _CELLS),  # Raw cell values in Board order
+        ("small", np.bool_),
+        ("color", np.int8),  # Raw value of the player who just moved
+        ("result", np.float32),  # 1 if the player who just moved went on to win, else 0
+        ("features", np.float32, len(FEATURES)),
+    ]
+)
+
+
+def features(board: Board, color: Space, prev_enemies: int) -> np.ndarray:
+    """
+    Args:
+        board (Board): The position after color's turn
+        color (Space): The player who just moved
+        prev_enemies (int): Opponent pieces on the board before the turn
+
+    Returns:
+        np.ndarray: The FEATURES of the position, as float32
+    """
+    other = Space.RED if color == Space.BLUE else Space.BLUE
+    geo = geometry(board.size)
+    ours, theirs = cells(board, color), cells(board, other)
+    return np.array(
+        [
+            len(board.mineable_by_player(color)),
+            len(board.mineable_by_player(other)),
+            prev_enemies - len(theirs),
+            geo.count_within(ours, theirs),
+            geo.count_within(ours, cells(board, Space.EMPTY)),
+        ],
+        dtype=np.float32,
+    )
+
+
+def positions(record: GameRecord) -> np.ndarray:
+    """
+    Turn a finished game into rows, one per turn, each the position after the turn
+    seen by the player who took it
+
+    Args:
+        record (GameRecord): The game. Games without a winner give no rows.
+
+    Returns:
+        np.ndarray: Array of POSITION rows
+    """
+    if record.winner is None:
+        return np.zeros(0, dtype=POSITION)
+    rows = np.zeros(len(record.turns), dtype=POSITION)
+    board = BitBoard(record.small)
+    for i, turn in enumerate(record.turns):
+        color = record.color(i)
+        other = Space.RED if color == Space.BLUE else Space.BLUE
+        prev_enemies = board.count_elements(other)
+        _apply(board, color, turn)
+        row = rows[i]
+        row["cells"][: len(board._cells)] = np.frombuffer(board._cells, dtype=np.int8)
+        row["small"] = record.small
+        row["color"] = color.value
+        row["result"] = color == record.winner
+        row["features"] = features(board, color, prev_enemies)
+    return rows
+
+
+def append(path: str, records: Iterable[GameRecord]) -> int:
+    """
+    Add the positions of some games to the end of a dataset file, creating it if
+    needed
+
+    Args:
+        path (str): The dataset file
+        records (Iterable[GameRecord]): The games
+
+    Returns:
+        int: Rows written
+    """
+    written = 0
+    with open(path, "ab") as file:
+        for record in records:
+            rows = positions(record)
+            rows.tofile(file)
+            written += len(rows)
+    return written
+
+
+def load(path: str) -> np.ndarray:
+    """
+    Open a dataset file without reading it into memory
+
+    Args:
+        path (str): The dataset file
+
+    Returns:
+        np.ndarray: Read-only memory-mapped array of POSITION rows
+    """
+    return np.memmap(path, dtype=POSITION, mode="r")
+
+
+def _chunks(data: np.ndarray, chunk: int) -> Iterable[tuple[np.ndarray, np.ndarray]]:
+    for start in range(0, len(data), chunk):
+        rows = data[start : start + chunk]
+        yield rows["features"].astype(np.float64), rows["result"].astype(np.float64)
+
+
+def loss(
+    data: np.ndarray, weights: np.ndarray, scale: float, chunk: int = 1 << 16
+) -> float:
+    """
+    Mean log loss of predicting each result as sigmoid(scale * features @ weights)
+
+    Args:
+        data (np.ndarray): POSITION rows, e.g. from load()
+        weights (np.ndarray): One weight per feature
+        scale (float): Converts evaluation units to log-odds
+        chunk (int, optional): Rows read at a time. Defaults to 65536.
+
+    Returns:
+        float: The loss
+    """
+    total = 0.0
+    for x, y in _chunks(data, chunk):
+        z = scale * (x @ weights)
+        # log(1 + e^z) - y z, computed without overflow
+        total += float(np.sum(np.logaddexp(0.0, z) - y * z))
+    return total / max(1, len(data))
+
+
+def fit_scale(
+    data: np.ndarray, weights: np.ndarray = HAND_WEIGHTS, chunk: int = 1 << 16
+) -> float:
+    """
+    Find the scale that makes some weights predict the results best, as Texel
+    tuning does before changing the weights. Golden-section search on a log scale.
+
+    Args:
+        data (np.ndarray): POSITION rows, e.g. from load()
+        weights (np.ndarray, optional): Weights to fit the scale for. Defaults to
+            finished_bot's.
+        chunk (int, optional): Rows read at a time. Defaults to 65536.
+
+    Returns:
+        float: The scale
+    """
+    lo, hi = -12.0, 2.0  # log10 of the scale
+    ratio = (math.sqrt(5) - 1) / 2
+    for _ in range(40):
+        a, b = hi - ratio * (hi - lo), lo + ratio * (hi - lo)
+        if loss(data, weights, 10**a, chunk) < loss(data, weights, 10**b, chunk):
+            hi = b
+        else:
+            lo = a
+    return 10 ** ((lo + hi) / 2)
+
+
+def tune(
+    data: np.ndarray,
+    weights: np.ndarray = HAND_WEIGHTS,
+    scale: float | None = None,
+    iterations: int = 20,
+    ridge: float = 1e-3,
+    chunk: int = 1 << 16,
+) -> np.ndarray:
+    """
+    Fit the weights by logistic regression on the results, keeping the scale fixed
+    so the answer stays in evaluation units. Each Newton step reads the data once,
+    a chunk at a time, so the dataset never has to fit in memory.
+
+    Args:
+        data (np.ndarray): POSITION rows, e.g. from load()
+        weights (np.ndarray, optional): Starting weights. Defaults to finished_bot's.
+        scale (float | None, optional): Evaluation units to log-odds. Defaults to
+            fit_scale() of the starting weights.
+        iterations (int, optional): Newton steps. Defaults to 20.
+        ridge (float, optional): L2 penalty on the log-odds weights, which keeps
+            features that never vary from blowing up. Defaults to 1e-3.
+        chunk (int, optional): Rows read at a time. Defaults to 65536.
+
+    Returns:
+        np.ndarray: The tuned weights
+    """
+    if scale is None:
+        scale = fit_scale(data, weights, chunk)
+    n = max(1, len(data))
+    beta = scale * np.asarray(weights, dtype=np.float64)
+    for _ in range(iterations):
+        gradient = ridge * beta
+        hessian = ridge * np.eye(len(beta))
+        for x, y in _chunks(data, chunk):
+            p = 0.5 + 0.5 * np.tanh(0.5 * (x @ beta))  # Sigmoid, without overflow
+            gradient += x.T @ (p - y) / n
+            hessian += (x.T * (p * (1 - p))) @ x / n
+        step = np.linalg.solve(hessian, gradient)
+        beta -= step
+        if np.max(np.abs(step)) < 1e-9:
+            break
+    return beta / scale
+
+
+def self_play(
+    red: Player, blue: Player, games: int, small: bool = False
+) -> Iterable[GameRecord]:
+    """
+    Play games in this process for a dataset
+
+    Args:
+        red (Player): The player moving first
+        blue (Player): The player moving second
+        games (int): How many games
+        small (bool, optional): Play on the small board. Defaults to False.
+
+    Yields:
+        GameRecord: Each finished game
+    """
+    for _ in range(games):
+        sim = Simulator(red, blue, small)
+        sim.play_game()
+        yield sim.record()
+
+
+def main():
+    from tournament import default_entrants
+
+    entrants = default_entrants()
+    parser = argparse.ArgumentParser(
+        description="Build position datasets and tune evaluation weights."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    play = commands.add_parser("selfplay", help="append self-play positions")
+    play.add_argument("dataset")
+    play.add_argument("--red", choices=list(entrants), default="random")
+    play.add_argument("--blue", choices=list(entrants), default="random")
+    play.add_argument("--games", type=int, default=100)
+    play.add_argument("--small", action="store_true")
+    convert = commands.add_parser("records", help="append recorded games' positions")
+    convert.add_argument("dataset")
+    convert.add_argument("records", help="record file, e.g. from tournament --records")
+    fit = commands.add_parser("tune", help="fit weights to a dataset")
+    fit.add_argument("dataset")
+    args = parser.parse_args()
+
+    if args.command == "selfplay":
+        red, blue = entrants[args.red](), entrants[args.blue]()
+        records = self_play(red, blue, args.games, args.small)
+        print(f"wrote {append(args.dataset, records)} positions")
+    elif args.command == "records":
+        with open(args.records, "rb") as file:
+            print(f"wrote {append(args.dataset, read_binary(file))} positions")
+    else:
+        data = load(args.dataset)
+        scale = fit_scale(data)
+        weights = tune(data, scale=scale)
+        print(f"{len(data)} positions, scale {scale:.3g}")
+        before, after = loss(data, HAND_WEIGHTS, scale), loss(data, weights, scale)
+        print(f"loss {before:.4f} -> {after:.4f}")
+        for name, old, new in zip(FEATURES, HAND_WEIGHTS, weights):
+            print(f"{name:<16}{old:>10.1f}{new:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+from board import Board, Space
+
+_EMPTY = Space.EMPTY.value
+_RED = Space.RED.value
+_BLUE = Space.BLUE.value
+
+
+class IncrementalEvaluator:
+    """
+    Keeps the local terms of finished_bot's evaluation up to date as a board changes,
+    so a leaf costs a lookup instead of a pass over every piece and its neighbors.
+
+    Tracked per cell change: piece counts, red-blue adjacent pairs, and pairs of a
+    piece and an empty neighbor. The mineable counts depend on reachability across
+    the whole board, so evaluate() still asks the board for them; a BitBoard answers
+    from its masks.
+    """
+
+    def __init__(self, board: Board):
+        """
+        Count the terms for a board and start following its changes. Call detach()
+        when done.
+
+        Args:
+            board (Board): The board to follow
+        """
+        self.board = board
+        cells = board._cells
+        neighbors = board._layout.neighbors
+        self.pieces = {_RED: cells.count(_RED), _BLUE: cells.count(_BLUE)}
+        self.contacts = 0
+        self.open_sides = {_RED: 0, _BLUE: 0}
+        for i, value in enumerate(cells):
+            if value in self.open_sides:
+                for n in neighbors[i]:
+                    if cells[n] == _EMPTY:
+                        self.open_sides[value] += 1
+                    elif value == _RED and cells[n] == _BLUE:
+                        self.contacts += 1
+        board.watch(self)
+
+    def detach(self):
+        """
+        Stop following the board. The counts go stale from here on.
+        """
+        self.board.unwatch(self)
+
+    def cell_changed(self, board: Board, i: int, old: int, new: int):
+        # Take away every pair the old value was part of, then add the new value's
+        cells = board._cells
+        open_sides = self.open_sides
+        for n in board._layout.neighbors[i]:
+            other = cells[n]
+            if old == _EMPTY:
+                if other in open_sides:
+                    open_sides[other] -= 1
+            elif old in open_sides:
+                if other == _EMPTY:
+                    open_sides[old] -= 1
+                elif other in open_sides and other != old:
+                    self.contacts -= 1
+            if new == _EMPTY:
+                if other in open_sides:
+                    open_sides[other] += 1
+            elif new in open_sides:
+                if other == _EMPTY:
+                    open_sides[new] += 1
+                elif other in open_sides and other != new:
+                    self.contacts += 1
+        if old in self.pieces:
+            self.pieces[old] -= 1
+        if new in self.pieces:
+            self.pieces[new] += 1
+
+    def evaluate(self, color: Space, prev_enemies: int) -> float:
+        """
+        Score the board for a player, equal to finished_bot.evaluate
+
+        Args:
+            color (Space): The player to score for
+            prev_enemies (int): Opponent pieces on the board before color's last turn,
+                as TurnSearch passes for each node
+
+        Returns:
+            float: The score, higher is better for color
+        """
+        other = Space.RED if color == Space.BLUE else Space.BLUE
+        ours = len(self.board.mineable_by_player(color))
+        theirs = len(self.board.mineable_by_player(other))
+        score = 40 * ours - 120 * theirs
+        if ours == 0:
+            score -= 1000000000
+        if theirs == 0:
+            score += 1000000000
+        return (
+            score
+            + 1000 * (prev_enemies - self.pieces[other.value])
+            + 150 * self.contacts
+            + 15 * self.open_sides[color.value]
+        )
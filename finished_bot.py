@@ -1,104 +1,57 @@
 from board import Board, Space, Coordinate
-from copy import deepcopy
+from book import OpeningBook, load
+from batch import evaluate_positions
+from bitboard import BitBoard
+from evaluation import IncrementalEvaluator
+from geometry import cells, geometry
+from game import TurnContext
+from ordering import MoveOrdering, turn_coordinates
+from search import Move, Turn, TurnSearch, legal_turns, merge_root_split
+import time
+from transposition import TranspositionTable
 import math
+from worker import HELPER_SLACK, PlayerCrashed, PlayerWorker
 
 class finished_bot:
     count = 0
 
-    def __init__(self, artificial_delay: float = 0):
+    def __init__(self, artificial_delay: float = 0, tt_megabytes: float = 16, depth: int = 1, workers: int = 1, batch_leaves: bool = False, book: OpeningBook | str | None = None):
         self.name = f"rando_{finished_bot.count}"
         self.artificial_delay = artificial_delay
+        self.tt_megabytes = tt_megabytes
+        self.depth = depth
+        # Score the leaves under a node that keeps failing low with one NumPy call, see
+        # TurnSearch. Off by default: it only pays off where most nodes are all-nodes
+        self.batch_leaves = batch_leaves
+        # Turns for the opening, found offline by book.build; a path is loaded here, once
+        self.book = load(book) if isinstance(book, str) else book
+        # With workers > 1 the dig search is split between this process and helpers,
+        # each a single-process copy of this bot with its own table. Started on first use.
+        self.helpers = [PlayerWorker(finished_bot(artificial_delay, tt_megabytes, depth, batch_leaves=batch_leaves)) for _ in range(workers - 1)]
+        # Built on first use, so it isn't pickled into every worker process
+        self.tt: TranspositionTable | None = None
+        # Killer and history tables for the turn search
+        self.turn_ordering = MoveOrdering(history_keys=turn_coordinates)
+        # (key of the board after our planned dig, the move planned to follow it)
+        self.planned_move: tuple[int, Move | None] | None = None
+        # Follows the board being searched, see _search
+        self.evaluator: IncrementalEvaluator | None = None
+        # Set by Game through begin_turn; without it we search to a fixed depth
+        self.context: TurnContext | None = None
         finished_bot.count += 1
 
-    def minimax(self, prev_board: Board, board: Board, depth: int, alpha: float, beta: float, maximizing_player: bool, color: Space) -> tuple[Coordinate | None, float]:
-        if depth == 0 or not board.mineable_by_player(color):
-            return None, self.evaluate(prev_board, board, color)
+    def begin_turn(self, context: TurnContext):
+        self.context = context
 
-        possible_mine = list(board.mineable_by_player(color))
-        best_mine = possible_mine[0]
-        other_color = Space.RED if color == Space.BLUE else Space.BLUE
-        
-        if maximizing_player:
-            max_eval = -math.inf
-            for mine in possible_mine:
-                board_copy = deepcopy(board)
-                board_copy[mine] = Space.EMPTY
-                current_eval = self.minimax(board, board_copy, depth - 1, alpha, beta, False, other_color)[1]
-                
-                if current_eval > max_eval:
-                    max_eval = current_eval
-                    best_mine = mine
-                
-                alpha = max(alpha, current_eval)
-                if beta <= alpha:
-                    break
-
-            return best_mine, max_eval
-        
-        else:
-            min_eval = math.inf
-            for mine in possible_mine:
-                board_copy = deepcopy(board)
-                board_copy[mine] = Space.EMPTY
-                current_eval = self.minimax(board, board_copy, depth - 1, alpha, beta, True, other_color)[1]
-                
-                if current_eval < min_eval:
-                    min_eval = current_eval
-                    best_mine = mine
-                
-                beta = min(beta, current_eval)
-                if beta <= alpha:
-                    break
+    def _start_search(self):
+        if self.tt is None:
+            self.tt = TranspositionTable(self.tt_megabytes)
+        self.tt.new_search()
+        self.turn_ordering.new_search()
 
-            return best_mine, min_eval
-
-    def movemax(self, prev_board: Board, board: Board, depth: int, alpha: float, beta: float, maximizing_player: bool, color: Space) -> tuple[tuple[Coordinate, Coordinate] | None, float]:
-        if depth == 0 or not board.mineable_by_player(color):
-            return None, self.evaluate_walking(prev_board, board, color)
-
-        player_locations = board.find_all(color)
-        other_color = Space.RED if color == Space.BLUE else Space.BLUE
-        best_move = None
-        
-        if maximizing_player:
-            max_eval = -math.inf
-            for location in player_locations:
-                for dest in board.walkable_from_coord(location):
-                    board_copy = deepcopy(board)
-                    board_copy[location], board_copy[dest] = Space.EMPTY, color
-                    current_eval = self.movemax(board, board_copy, depth - 1, alpha, beta, False, other_color)[1]
-                    
-                    if current_eval > max_eval:
-                        max_eval = current_eval
-                        best_move = (location, dest)
-                    
-                    alpha = max(alpha, current_eval)
-                    if beta <= alpha:
-                        return best_move, max_eval
-                    
-                    board_copy[location], board_copy[dest] = color, Space.EMPTY  # Undo move
-            return best_move, max_eval
-        
-        else:
-            min_eval = math.inf
-            for location in player_locations:
-                for dest in board.walkable_from_coord(location):
-                    board_copy = deepcopy(board)
-                    board_copy[location], board_copy[dest] = Space.EMPTY, color
-                    current_eval = self.movemax(board, board_copy, depth - 1, alpha, beta, True, other_color)[1]
-                    
-                    if current_eval < min_eval:
-                        min_eval = current_eval
-                        best_move = (location, dest)
-                    
-                    beta = min(beta, current_eval)
-                    if beta <= alpha:
-                        return best_move, min_eval
-                    
-                    board_copy[location], board_copy[dest] = color, Space.EMPTY  # Undo move
-            return best_move, min_eval
-
-    def evaluate(self, prev_board: Board, board: Board, color: Space) -> float:
+    def evaluate(self, prev_enemies: int, board: Board, color: Space) -> float:
+        if self.evaluator is not None and self.evaluator.board is board:
+            return self.evaluator.evaluate(color, prev_enemies)
         len_our_mineable = len(board.mineable_by_player(color))
         other_color = Space.RED if color == Space.BLUE else Space.BLUE
         len_other_mineable = len(board.mineable_by_player(other_color))
@@ -109,27 +62,20 @@ class finished_bot:
         if len_other_mineable == 0: 
             general_weight += 1000000000
 
-        return general_weight + self.evaluate_walking(prev_board, board, color)
+        return general_weight + self.evaluate_walking(prev_enemies, board, color)
 
-    def evaluate_walking(self, prev_board: Board, board: Board, color: Space) -> float:
+    def evaluate_walking(self, prev_enemies: int, board: Board, color: Space) -> float:
         other_color = Space.RED if color == Space.BLUE else Space.BLUE
-        our_spaces = board.find_all(color)
-        other_spaces = board.find_all(other_color)
-        walking_weight = 1000 * (len(prev_board.find_all(other_color)) - len(other_spaces))
-        
-        for us in our_spaces:
-            for other in other_spaces:
-                if self.distance(us, other) == 1:
-                    walking_weight += 150
-            for walkable in board.walkable_from_coord(us):
-                if self.distance(us, walkable) == 1:
-                    walking_weight += 15
+        geo = geometry(board.size)
+        ours = cells(board, color)
+        others = cells(board, other_color)
+        walking_weight = 1000 * (prev_enemies - len(others))
+        walking_weight += 150 * geo.count_within(ours, others)
+        # Every empty neighbor can be walked to, so those are the walkable cells one step away
+        walking_weight += 15 * geo.count_within(ours, cells(board, Space.EMPTY))
         
         return walking_weight - 100 * len(board.mineable_by_player(other_color))
 
-    def distance(self, start: Coordinate, dest: Coordinate) -> int:
-        return max(abs(start[0] - dest[0]), abs(start[1] - dest[1]), abs(-start[0] - start[1] - (-dest[0] - dest[1])))
-
     """def closest_teammate(self, color: Space, board: Board) -> float:
         min_dist = math.inf
         ours = board.find_all(color)
@@ -148,8 +94,76 @@ class finished_bot:
                     max_dist = max(max_dist, self.distance(us, other))
         return max_dist"""
 
+    def evaluate_turn(self, board: Board, color: Space, prev_enemies: int) -> float:
+        return self.evaluate(prev_enemies, board, color)
+
+    # One search covers the whole turn: mine() picks the dig and remembers the move
+    # that goes with it, and move() plays it if the board is the one we planned for
+    def _search(self, board: Board, color: Space, dig_done: bool = False) -> Turn:
+        start = time.monotonic()
+        if self.helpers and not dig_done:
+            deadline = math.inf if self.context is None else start + self.context.budget()
+            return self._split_search(board, color, deadline)
+        self._start_search()
+        searcher = TurnSearch(self.evaluate_turn, self.tt, self.turn_ordering, evaluate_positions if self.batch_leaves else None)
+        # The search makes and unmakes turns on this board, and the evaluator follows along
+        self.evaluator = IncrementalEvaluator(board)
+        try:
+            if self.context is None:
+                return searcher.search(board, color, self.depth, dig_done)[0]
+            return searcher.iterative_deepening(board, color, start + self.context.budget(), dig_done=dig_done)[0]
+        finally:
+            self.evaluator.detach()
+            self.evaluator = None
+
+    # Root splitting: the digs are dealt out between this process and the helpers, each
+    # deepens its share until the deadline, and the best turn is taken from the deepest
+    # iteration all of them finished
+    def _split_search(self, board: Board, color: Space, deadline: float) -> Turn:
+        digs = list(board.mineable_by_player(color))
+        shares = [digs[i :: len(self.helpers) + 1] for i in range(len(self.helpers) + 1)]
+        max_depth = self.depth if deadline == math.inf else 64
+        busy = []
+        for helper, share in zip(self.helpers, shares[1:]):
+            if share:
+                helper.submit("search_digs", (board, color, share, deadline, max_depth))
+                busy.append(helper)
+        results = [self.search_digs(board, color, shares[0], deadline, max_depth)]
+        for helper in busy:
+            # Our own share has used up part of the budget, so only wait for what's left
+            timeout = None if deadline == math.inf else max(0.0, deadline + HELPER_SLACK - time.monotonic())
+            try:
+                results.append(helper.result(timeout)[0])
+            except (TimeoutError, PlayerCrashed):
+                pass  # Its digs go unsearched; it restarts with an empty table
+        turn = merge_root_split(results)
+        return turn if turn is not None else legal_turns(board, color)[0]
+
+    def search_digs(self, board: Board, color: Space, digs: list[Coordinate], deadline: float, max_depth: int) -> list[tuple[int, Turn | None, float]]:
+        self._start_search()
+        searcher = TurnSearch(self.evaluate_turn, self.tt, self.turn_ordering, evaluate_positions if self.batch_leaves else None)
+        self.evaluator = IncrementalEvaluator(board)
+        try:
+            searcher.iterative_deepening(board, color, deadline, max_depth, root_digs=digs)
+        finally:
+            self.evaluator.detach()
+            self.evaluator = None
+        return searcher.completed
+
     def mine(self, board: Board, color: Space) -> Coordinate:
-        return self.minimax(board, board, 3, -math.inf, math.inf, True, color)[0]
+        board = BitBoard.from_board(board)
+        turn = self.book.lookup(board, color) if self.book is not None else None
+        dig, move = turn if turn is not None else self._search(board, color)
+        undo = board.apply_dig(dig, color)
+        self.planned_move = (board.zobrist_key, move)
+        board.undo(undo)
+        return dig
 
     def move(self, board: Board, color: Space) -> tuple[Coordinate, Coordinate] | None:
-        return self.movemax(board, board, 3, -math.inf, math.inf, True, color)[0]
\ No newline at end of file
+        if self.planned_move is not None and self.planned_move[0] == board.zobrist_key:
+            move = self.planned_move[1]
+            self.planned_move = None
+            return move
+        # No plan for this board (e.g. mine() ran in another process), so search just the move
+        board = BitBoard.from_board(board)
+        return self._search(board, color, dig_done=True)[1]
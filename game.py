@@ -1,10 +1,10 @@
 from copy import copy
 import time
-import traceback
-from typing import Protocol
-from multiprocessing import Pool, TimeoutError
+from typing import NamedTuple, Protocol
 
 from board import Coordinate, Board, Space
+from records import GameRecord, Recorder
+from worker import PlayerCrashed, PlayerWorker
 
 
 class Player(Protocol):
@@ -19,6 +19,70 @@ class Player(Protocol):
     ) -> tuple[Coordinate, Coordinate] | None: ...
 
 
+class TurnContext(NamedTuple):
+    """
+    Read-only snapshot of the game handed to players before each mine and move call
+    """
+
+    time_left: float  # Seconds left for the rest of this turn, reserve included
+    time_per_move: float  # Seconds granted every turn before the reserve is touched
+    reserve_time: float  # This player's reserve at the start of the turn
+    opponent_reserve_time: float
+    turn: int  # Turns completed so far in the game, by both players
+    # The opponent's previous dig and move, None before they have played
+    opponent_last_action: tuple[Coordinate, tuple[Coordinate, Coordinate] | None] | None
+    dig_done: bool  # False before mine, True before move
+
+    def budget(self) -> float:
+        """
+        Suggested seconds to think for in this call. mine() and move() share one
+        clock per turn, so the dig gets most of the turn's time plus a small slice of
+        the reserve, leaving room for the move to be searched too.
+
+        Returns:
+            float: Seconds to spend, never more than a third of time_left
+        """
+        if self.dig_done:
+            return min(0.25 * self.time_per_move, 0.25 * self.time_left)
+        return min(
+            0.55 * self.time_per_move + self.reserve_time / 15, self.time_left / 3
+        )
+
+
+class ContextPlayer(Player, Protocol):
+    """
+    Optional extension of Player. Game calls begin_turn with a fresh TurnContext before
+    every mine and move call, in the player's worker process, so the player can budget
+    against its clock. Players without begin_turn are called exactly as before.
+    """
+
+    def begin_turn(self, context: TurnContext) -> None: ...
+
+
+def legal_dig(board: Board, coord: Coordinate) -> bool:
+    """
+    Check a dig the way Game does. Only the neighbor-count rule applies; the wall
+    doesn't have to be reachable.
+    """
+    return coord in board and board.is_mineable(coord)
+
+
+def legal_move(
+    board: Board, color: Space, move: tuple[Coordinate, Coordinate] | None
+) -> bool:
+    """
+    Check a move the way Game does. Not moving is always legal.
+    """
+    if move is None:
+        return True
+    start, end = move
+    return (
+        start in board
+        and board[start] == color
+        and end in board.walkable_from_coord(start)
+    )
+
+
 class Game:
 
     def __init__(
@@ -37,107 +101,156 @@ class Game:
         self.time_per_move = time_per_move
         self.min_sleep_time = min_sleep_time
         self.reserve_time = {Space.RED: reserve_time, Space.BLUE: reserve_time}
+        self.turn = 0
+        # Per-player seconds spent on each completed turn, and why the game ended early
+        # ("timeout", "crash", "illegal dig" or "illegal move") if it did
+        self.move_times: dict[Space, list[float]] = {Space.RED: [], Space.BLUE: []}
+        self.fault: str | None = None
+        # One long-lived process per player, started on first use
+        self.workers: dict[Space, PlayerWorker] = {}
+        self.last_action: dict[
+            Space, tuple[Coordinate, tuple[Coordinate, Coordinate] | None]
+        ] = {}
+        self.recorder = Recorder(small, red.name, blue.name)
+
+    def record(self) -> GameRecord:
+        """
+        Returns:
+            GameRecord: The turns played so far, with the result if the game is over
+        """
+        return self.recorder.record(self.winner, self.fault)
 
     def step(self):
         if self.winner:
             return
+        self._step()
+        if self.winner:
+            self.close()
+
+    def _step(self):
         player_color = Space.RED if self.red_turn else Space.BLUE
         other_color = Space.BLUE if self.red_turn else Space.RED
         total_time = self.time_per_move + self.reserve_time[player_color]
         available_time = total_time
         player = self.players[player_color]
+        step_start = time.monotonic()
         # Check if a player just lost by not being able to mine
         if len(self.board.mineable_by_player(player_color)) == 0:
             self.winner = other_color
             return
+        worker = self._worker(player_color)
         # Current player needs to dig out a space
-        with Pool(processes=1) as pool:
-            mine_res = pool.apply_async(
-                player.mine, (copy(self.board), player_color)
+        try:
+            mine_coord, elapsed = worker.call(
+                "mine",
+                (copy(self.board), player_color),
+                available_time,
+                self._turn_context(player_color, available_time, False),
             )
-            try:
-                start_time = time.monotonic()
-                mine_coord = mine_res.get(available_time)
-                end_time = time.monotonic()
-                available_time -= end_time - start_time
-            # Player crashed or timed out
-            except TimeoutError:
-                self.winner = other_color
-                print(f"{player.name} timed out!")
-                return
-            except Exception:
-                self.winner = other_color
-                print(f"{player.name} crashed!")
-                traceback.print_exc()
-                return
+            available_time -= elapsed
+        # Player crashed or timed out
+        except TimeoutError:
+            self.winner = other_color
+            self.fault = "timeout"
+            print(f"{player.name} timed out!")
+            return
+        except PlayerCrashed as e:
+            self.winner = other_color
+            self.fault = "crash"
+            print(f"{player.name} crashed!")
+            print(e)
+            return
         # Current player made an illegal dig
-        if not self.board.is_mineable(mine_coord):
+        if not legal_dig(self.board, mine_coord):
             print(f"{player.name} illegally tried to mine at {mine_coord}")
             self.winner = other_color
+            self.fault = "illegal dig"
             return
         # Dig out the space
-        self.board[mine_coord] = (
-            Space.EMPTY
-            if self.board.count_elements(player_color) == self.board.miner_count
-            else player_color
-        )
+        self.board.apply_dig(mine_coord, player_color)
         # Current player may move
-        with Pool(processes=2) as pool:
-            if self.min_sleep_time > 0:
-                sleep_time = max(
-                    0,
-                    min(
-                        available_time,
-                        self.min_sleep_time
-                        - (
-                            self.time_per_move
-                            + self.reserve_time[player_color]
-                            - available_time
-                        ),
-                    ),
-                )
-                delay = pool.apply_async(time.sleep, (sleep_time,))
-            move_res = pool.apply_async(
-                player.move, (copy(self.board), player_color)
+        try:
+            move, elapsed = worker.call(
+                "move",
+                (copy(self.board), player_color),
+                available_time,
+                self._turn_context(player_color, available_time, True),
             )
-            try:
-                if self.min_sleep_time > 0:
-                    delay.get()
-                start_time = time.monotonic()
-                move = move_res.get(available_time)
-                end_time = time.monotonic()
-                available_time -= end_time - start_time
-                self.reserve_time[player_color] -= max(0, total_time - available_time - self.time_per_move)
-            # player crashed or timed out
-            except TimeoutError:
-                self.winner = other_color
-                print(f"{player.name} timed out!")
-                return
-            except Exception:
-                self.winner = other_color
-                print(f"{player.name} crashed!")
-                traceback.print_exc()
-                return
+            available_time -= elapsed
+            self.reserve_time[player_color] -= max(0, total_time - available_time - self.time_per_move)
+            self.move_times[player_color].append(total_time - available_time)
+        # player crashed or timed out
+        except TimeoutError:
+            self.winner = other_color
+            self.fault = "timeout"
+            print(f"{player.name} timed out!")
+            return
+        except PlayerCrashed as e:
+            self.winner = other_color
+            self.fault = "crash"
+            print(f"{player.name} crashed!")
+            print(e)
+            return
+        # Pad the turn out to min_sleep_time; the wait isn't charged to the player
+        if self.min_sleep_time > 0:
+            time.sleep(max(0, self.min_sleep_time - (time.monotonic() - step_start)))
         if move is not None:
             move_start, move_end = move
-            if self.board[
-                move_start
-            ] != player_color or move_end not in self.board.walkable_from_coord(
-                move_start
-            ):
+            if not legal_move(self.board, player_color, move):
                 print(
                     f"{player.name} tried to illegally move from {move_start} to {move_end}."
                 )
                 self.winner = other_color
+                self.fault = "illegal move"
                 return
-            self.board[move_start] = Space.EMPTY
-            self.board[move_end] = player_color
+            self.board.apply_move(move_start, move_end)
         # Clear dead enemies
-        self.board.clear_dead(other_color)
+        killed = self.board.clear_dead(other_color)
+        self.recorder.add(
+            self.board, mine_coord, move, killed, self.move_times[player_color][-1]
+        )
+        self.last_action[player_color] = (mine_coord, move)
+        self.turn += 1
         # Switch players
         self.red_turn = not self.red_turn
 
+    def _worker(self, color: Space) -> PlayerWorker:
+        if color not in self.workers:
+            self.workers[color] = PlayerWorker(self.players[color])
+        return self.workers[color]
+
+    def close(self):
+        """
+        Shut down the players' worker processes. A later step starts new ones.
+        """
+        for worker in self.workers.values():
+            worker.close()
+        self.workers.clear()
+
+    def __enter__(self) -> "Game":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _turn_context(
+        self, color: Space, time_left: float, dig_done: bool
+    ) -> TurnContext:
+        other_color = Space.RED if color == Space.BLUE else Space.BLUE
+        return TurnContext(
+            time_left=time_left,
+            time_per_move=self.time_per_move,
+            reserve_time=self.reserve_time[color],
+            opponent_reserve_time=self.reserve_time[other_color],
+            turn=self.turn,
+            opponent_last_action=self.last_action.get(other_color),
+            dig_done=dig_done,
+        )
+
     def play_game(self) -> Space:
-        while not self.winner:
-            self.step()
+        try:
+            while not self.winner:
+                self.step()
+        finally:
+            self.close()
         return self.winner
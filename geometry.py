@@ -0,0 +1,168 @@
+import math
+from functools import cache
+from typing import Iterable
+
+import numpy as np
+
+from board import Board, Coordinate, Space, _layout
+
+
+def distance(start: Coordinate, dest: Coordinate) -> int:
+    """
+    Number of steps between two hexes, whether or not they are on a board
+
+    Args:
+        start (Coordinate): One hex
+        dest (Coordinate): The other hex
+
+    Returns:
+        int: The hex distance between them
+    """
+    dq = start[0] - dest[0]
+    dr = start[1] - dest[1]
+    return max(abs(dq), abs(dr), abs(dq + dr))
+
+
+class Geometry:
+    """
+    Distances between every pair of cells of one board size, and the cells at each
+    distance from every cell. Built once per size, see geometry().
+
+    Cells are numbered the way Board numbers them, so index lists from a board can be
+    used directly.
+    """
+
+    def __init__(self, size: int):
+        layout = _layout(size)
+        self.size = size
+        self.index = layout.index
+        self.axial = layout.axial
+        cube = np.array(layout.coords, dtype=np.int16)
+        self.distances: np.ndarray = (
+            np.abs(cube[:, None, :] - cube[None, :, :]).max(axis=2).astype(np.int8)
+        )
+        # rings[i][d] holds the cells exactly d steps from cell i
+        self.rings: tuple[tuple[tuple[int, ...], ...], ...] = tuple(
+            tuple(tuple(np.flatnonzero(row == d).tolist()) for d in range(2 * size - 1))
+            for row in self.distances
+        )
+
+    def indices(self, coords: Iterable[Coordinate]) -> list[int]:
+        """
+        Args:
+            coords (Iterable[Coordinate]): Coordinates on the board
+
+        Returns:
+            list[int]: The cell index of each coordinate, in the same order
+        """
+        index = self.index
+        return [index[coord] for coord in coords]
+
+    def distance(self, start: Coordinate, dest: Coordinate) -> int:
+        """
+        Same as the module's distance(), by table lookup. Both hexes must be on the
+        board.
+        """
+        return int(self.distances[self.index[start], self.index[dest]])
+
+    def ring(self, center: Coordinate, radius: int) -> list[Coordinate]:
+        """
+        Args:
+            center (Coordinate): The middle of the ring
+            radius (int): Distance from the center
+
+        Returns:
+            list[Coordinate]: The on-board hexes exactly radius steps from center
+        """
+        rings = self.rings[self.index[center]]
+        if not 0 <= radius < len(rings):
+            return []
+        axial = self.axial
+        return [axial[i] for i in rings[radius]]
+
+    def nearest(self, sources: list[int], targets: list[int]) -> float:
+        """
+        Smallest distance between a source cell and a different target cell
+
+        Args:
+            sources (list[int]): Cell indices
+            targets (list[int]): Cell indices, may overlap sources
+
+        Returns:
+            float: The distance, or math.inf if there is no such pair
+        """
+        if not sources or not targets:
+            return math.inf
+        block = self.distances[np.ix_(sources, targets)]
+        apart = block[block > 0]
+        return int(apart.min()) if apart.size else math.inf
+
+    def count_within(self, sources: list[int], targets: list[int], radius: int = 1) -> int:
+        """
+        Count the (source, target) pairs of different cells at most radius apart
+
+        Args:
+            sources (list[int]): Cell indices
+            targets (list[int]): Cell indices, may overlap sources
+            radius (int, optional): Largest distance counted. Defaults to 1, i.e.
+                neighbors.
+
+        Returns:
+            int: The number of pairs
+        """
+        if not sources or not targets:
+            return 0
+        block = self.distances[np.ix_(sources, targets)]
+        return int(np.count_nonzero((block > 0) & (block <= radius)))
+
+
+@cache
+def geometry(size: int) -> Geometry:
+    """
+    Args:
+        size (int): The board size, as in Board.size
+
+    Returns:
+        Geometry: The shared tables for that size
+    """
+    return Geometry(size)
+
+
+def cells(board: Board, space: Space) -> list[int]:
+    """
+    Args:
+        board (Board): The board to look at
+        space (Space): What to look for
+
+    Returns:
+        list[int]: The index of every cell holding that space, for the Geometry queries
+    """
+    return board._indices_of(space.value)
+
+
+def nearest_teammate(board: Board, color: Space) -> float:
+    """
+    Args:
+        board (Board): The board to look at
+        color (Space): The player
+
+    Returns:
+        float: Distance between the player's two closest pieces, or math.inf with
+            fewer than two pieces
+    """
+    ours = cells(board, color)
+    return geometry(board.size).nearest(ours, ours)
+
+
+def nearest_enemy(board: Board, color: Space) -> float:
+    """
+    Args:
+        board (Board): The board to look at
+        color (Space): The player
+
+    Returns:
+        float: Distance from the player's pieces to the closest enemy piece, or
+            math.inf if either side has no pieces
+    """
+    enemy = Space.RED if color == Space.BLUE else Space.BLUE
+    return geometry(board.size).nearest(cells(board, color), cells(board, enemy))
@@ -0,0 +1,303 @@
+import math
+import time
+from copy import copy
+from random import Random
+
+from bitboard import BitBoard
+from board import Board, Space
+from search import Turn, legal_moves, legal_turns, other_color
+
+# Visits and summed results, for the player taking the turn, of each turn at the root
+RootStats = dict[Turn, tuple[int, float]]
+
+
+class _Node:
+    """
+    A position in the tree, reached from its parent by `turn`. Results are summed from
+    the point of view of the player who took that turn.
+    """
+
+    __slots__ = (
+        "turn",
+        "parent",
+        "color",
+        "key",
+        "dig_done",
+        "children",
+        "untried",
+        "visits",
+        "wins",
+    )
+
+    def __init__(
+        self,
+        turn: Turn | None,
+        parent: "_Node | None",
+        color: Space,
+        key: int,
+        dig_done: bool = False,
+    ):
+        self.turn = turn
+        self.parent = parent
+        self.color = color  # The player to move here
+        self.key = key  # Zobrist key of the board here
+        self.dig_done = dig_done
+        self.children: list[_Node] = []
+        self.untried: list[Turn] | None = None  # Filled in on the second visit
+        self.visits = 0
+        self.wins = 0.0
+
+
+def _ordered_turns(
+    board: Board, color: Space, dig_done: bool, rng: Random
+) -> list[Turn]:
+    # Turns are expanded from the end of the list. The digs are interleaved so a node
+    # tries every dig once before it tries a second move after any of them.
+    if dig_done:
+        turns: list[Turn] = [(None, move) for move in legal_moves(board, color)]
+        rng.shuffle(turns)
+        return turns
+    by_dig: dict = {}
+    for turn in legal_turns(board, color):
+        by_dig.setdefault(turn[0], []).append(turn)
+    groups = list(by_dig.values())
+    for group in groups:
+        rng.shuffle(group)
+    longest = max(map(len, groups), default=0)
+    ordered = [group[i] for i in range(longest) for group in groups if i < len(group)]
+    ordered.reverse()
+    return ordered
+
+
+def estimate(board: Board) -> float:
+    """
+    Guess red's chance of winning from material and how many walls each side can dig
+
+    Args:
+        board (Board): The position to judge
+
+    Returns:
+        float: Probability between 0 and 1
+    """
+    mobility = len(board.mineable_by_player(Space.RED)) - len(
+        board.mineable_by_player(Space.BLUE)
+    )
+    material = board.count_elements(Space.RED) - board.count_elements(Space.BLUE)
+    return 1 / (1 + math.exp(-(0.25 * mobility + 0.75 * material)))
+
+
+def rollout(
+    board: Board, color: Space, rng: Random, max_turns: int | None = None
+) -> float:
+    """
+    Play random turns, chosen the way RandomPlayer does, until someone can't dig or
+    max_turns turns have been played
+
+    Args:
+        board (Board): The position to play from. Modified in place.
+        color (Space): The player to move
+        rng (Random): Source of randomness
+        max_turns (int | None, optional): Stop here and use estimate() instead of
+            playing to the end. Defaults to no limit.
+
+    Returns:
+        float: 1 if red won, 0 if blue won, or estimate() if the game was cut short
+    """
+    other = other_color(color)
+    turns = 0
+    while max_turns is None or turns < max_turns:
+        mineable = board.mineable_by_player(color)
+        if not mineable:
+            return 1.0 if other == Space.RED else 0.0
+        board.apply_dig(rng.choice(tuple(mineable)), color)
+        start = rng.choice(tuple(board.find_all(color)))
+        ends = board.walkable_from_coord(start)
+        if ends:
+            board.apply_move(start, rng.choice(tuple(ends)))
+        board.clear_dead(other)
+        color, other = other, color
+        turns += 1
+    return estimate(board)
+
+
+class MCTS:
+    """
+    Monte Carlo tree search (UCT) where one action is a whole turn: a dig, an
+    optional move and the clear_dead that follows. The tree is kept between searches
+    and re-rooted at the position searched next, found by its Zobrist key, so work
+    from the dig search carries over to the move search and to the next turn.
+    """
+
+    def __init__(
+        self,
+        exploration: float = 1.0,
+        rollout_turns: int | None = 8,
+        seed: int | None = None,
+    ):
+        """
+        Args:
+            exploration (float, optional): UCT exploration constant. Defaults to 1.0.
+            rollout_turns (int | None, optional): Turns played in each rollout before
+                estimating the result, or None to play to the end. Defaults to 8.
+            seed (int | None, optional): Seed for the rollouts and expansion order.
+                Defaults to None.
+        """
+        self.exploration = exploration
+        self.rollout_turns = rollout_turns
+        self.rng = Random(seed)
+        self.root: _Node | None = None
+        self.board: BitBoard | None = None  # The position at the root
+        self.iterations = 0  # Done by the last search
+
+    def search(
+        self,
+        board: Board,
+        color: Space,
+        deadline: float = math.inf,
+        dig_done: bool = False,
+        iterations: int | None = None,
+    ) -> RootStats:
+        """
+        Grow the tree from a position until the deadline or the iteration limit. At
+        least one iteration is always run.
+
+        Args:
+            board (Board): The position to search. Not modified.
+            color (Space): The player to move
+            deadline (float, optional): time.monotonic() value at which to stop.
+                Defaults to no deadline.
+            dig_done (bool, optional): The player has already dug this turn, so only
+                the move is left to choose. Defaults to False.
+            iterations (int | None, optional): Stop after this many iterations.
+                Defaults to no limit.
+
+        Returns:
+            RootStats: Visits and wins of every turn tried at the root
+        """
+        self._reroot(board, color, dig_done)
+        self.iterations = 0
+        while self.iterations == 0 or (
+            time.monotonic() < deadline
+            and (iterations is None or self.iterations < iterations)
+        ):
+            self._iterate()
+            self.iterations += 1
+        return {child.turn: (child.visits, child.wins) for child in self.root.children}
+
+    def _iterate(self):
+        board = self.board
+        node = self.root
+        undo = []
+        # Selection: descend through fully expanded nodes
+        while node.untried == [] and node.children:
+            node = self._select(node)
+            undo.append(board.apply_turn(node.parent.color, *node.turn))
+        if node.untried is None:
+            node.untried = _ordered_turns(board, node.color, node.dig_done, self.rng)
+        if node.untried:
+            # Expansion, then a rollout from the new child
+            turn = node.untried.pop()
+            undo.append(board.apply_turn(node.color, *turn))
+            child = _Node(turn, node, other_color(node.color), board.zobrist_key)
+            node.children.append(child)
+            node = child
+            red_wins = rollout(copy(board), node.color, self.rng, self.rollout_turns)
+        else:
+            # Terminal: the player to move can't dig and has lost
+            red_wins = 0.0 if node.color == Space.RED else 1.0
+        for record in reversed(undo):
+            board.undo(record)
+        while node is not None:
+            node.visits += 1
+            node.wins += red_wins if node.color == Space.BLUE else 1 - red_wins
+            node = node.parent
+
+    def _select(self, node: _Node) -> _Node:
+        scale = self.exploration * math.sqrt(math.log(node.visits))
+        return max(
+            node.children,
+            key=lambda child: child.wins / child.visits
+            + scale / math.sqrt(child.visits),
+        )
+
+    def _reroot(self, board: Board, color: Space, dig_done: bool):
+        key = board.zobrist_key
+        root = self._find(key, color, dig_done)
+        if root is None and dig_done:
+            root = self._after_dig(board, color)
+        if root is None:
+            root = _Node(None, None, color, key, dig_done)
+        root.parent = root.turn = None
+        self.root = root
+        self.board = BitBoard.from_board(board)
+
+    def _find(self, key: int, color: Space, dig_done: bool) -> _Node | None:
+        # The same position, or one reached by one or two turns from it
+        if self.root is None:
+            return None
+        level = [self.root]
+        for _ in range(3):
+            for node in level:
+                if (node.key, node.color, node.dig_done) == (key, color, dig_done):
+                    return node
+            level = [child for node in level for child in node.children]
+        return None
+
+    def _after_dig(self, board: Board, color: Space) -> _Node | None:
+        # Build a move-only root from the root's children that start with the dig
+        # that was actually made, keeping their statistics and subtrees
+        old = self.root
+        if old is None or old.dig_done or old.color != color:
+            return None
+        for dig in {child.turn[0] for child in old.children}:
+            undo = self.board.apply_dig(dig, color)
+            dug_key = self.board.zobrist_key
+            self.board.undo(undo)
+            if dug_key != board.zobrist_key:
+                continue
+            root = _Node(None, None, color, dug_key, dig_done=True)
+            for child in old.children:
+                if child.turn[0] == dig:
+                    child.turn = (None, child.turn[1])
+                    child.parent = root
+                    root.children.append(child)
+                    root.visits += child.visits
+            tried = {child.turn for child in root.children}
+            root.untried = [
+                turn
+                for turn in _ordered_turns(board, color, True, self.rng)
+                if turn not in tried
+            ]
+            return root
+        return None
+
+
+def best_turn(stats: RootStats) -> Turn | None:
+    """
+    Pick the most visited turn, breaking ties by wins
+
+    Args:
+        stats (RootStats): Root statistics from one or more searches
+
+    Returns:
+        Turn | None: The turn to play, or None if the stats are empty
+    """
+    return max(stats, key=lambda turn: stats[turn], default=None)
+
+
+def merge_stats(all_stats: list[RootStats]) -> RootStats:
+    """
+    Add up root statistics from independent searches of the same position
+
+    Args:
+        all_stats (list[RootStats]): One entry per search
+
+    Returns:
+        RootStats: Summed visits and wins per turn
+    """
+    out: RootStats = {}
+    for stats in all_stats:
+        for turn, (visits, wins) in stats.items():
+            total_visits, total_wins = out.get(turn, (0, 0.0))
+            out[turn] = (total_visits + visits, total_wins + wins)
+    return out
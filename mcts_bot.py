@@ -0,0 +1,88 @@
+import math
+import time
+
+from bitboard import BitBoard
+from board import Board, Coordinate, Space
+from game import TurnContext
+from mcts import MCTS, RootStats, best_turn, merge_stats
+from search import Turn, legal_turns
+from worker import HELPER_SLACK, PlayerCrashed, PlayerWorker
+
+
+class MCTSPlayer:
+    """
+    Plays by Monte Carlo tree search over whole turns. With workers > 1 the search is
+    root-parallel: helper processes grow independent trees of the same position and
+    their root statistics are added to ours before choosing.
+    """
+
+    count = 0
+
+    def __init__(
+        self,
+        exploration: float = 1.0,
+        rollout_turns: int | None = 8,
+        iterations: int = 300,
+        workers: int = 1,
+        seed: int | None = None,
+    ):
+        """
+        Args:
+            exploration (float, optional): UCT exploration constant. Defaults to 1.0.
+            rollout_turns (int | None, optional): Turns per rollout before estimating
+                the result, or None to play to the end. Defaults to 8.
+            iterations (int, optional): Iterations per search when there is no clock to
+                budget against. Defaults to 300.
+            workers (int, optional): Processes searching each position, this one
+                included. Defaults to 1.
+            seed (int | None, optional): Seed for the searches. Defaults to None.
+        """
+        self.name = f"mcts_{MCTSPlayer.count}"
+        self.iterations = iterations
+        self.tree = MCTS(exploration, rollout_turns, seed)
+        # Started on first use, so only the process actually playing runs them
+        self.helpers = [
+            PlayerWorker(
+                MCTS(exploration, rollout_turns, None if seed is None else seed + i)
+            )
+            for i in range(1, workers)
+        ]
+        # Set by Game through begin_turn; without it we search a fixed iteration count
+        self.context: TurnContext | None = None
+        MCTSPlayer.count += 1
+
+    def begin_turn(self, context: TurnContext):
+        self.context = context
+
+    def _search(self, board: Board, color: Space, dig_done: bool) -> Turn:
+        board = BitBoard.from_board(board)
+        if self.context is None:
+            deadline, iterations = math.inf, self.iterations
+        else:
+            deadline, iterations = time.monotonic() + self.context.budget(), None
+        args = (board, color, deadline, dig_done, iterations)
+        for helper in self.helpers:
+            helper.submit("search", args)
+        all_stats: list[RootStats] = [self.tree.search(*args)]
+        for helper in self.helpers:
+            # Wait only for what's left of the budget after our own search
+            timeout = (
+                None
+                if deadline == math.inf
+                else max(0.0, deadline + HELPER_SLACK - time.monotonic())
+            )
+            try:
+                all_stats.append(helper.result(timeout)[0])
+            except (TimeoutError, PlayerCrashed):
+                pass  # The helper was killed and restarts with an empty tree
+        turn = best_turn(merge_stats(all_stats))
+        if turn is None:
+            turn = (None, None) if dig_done else legal_turns(board, color)[0]
+        return turn
+
+    def mine(self, board: Board, color: Space) -> Coordinate:
+        return self._search(board, color, dig_done=False)[0]
+
+    def move(self, board: Board, color: Space) -> tuple[Coordinate, Coordinate] | None:
+        # The tree re-roots at the dig we just made, so this continues the mine search
+        return self._search(board, color, dig_done=True)[1]
@@ -0,0 +1,158 @@
+from typing import Any, Callable, Hashable, Iterable, TypeVar
+
+from board import Board, Coordinate, Space
+
+A = TypeVar("A", bound=Hashable)
+
+
+def whole_action(action: Hashable) -> tuple[Hashable, ...]:
+    """
+    History key for actions that repeat as they are, e.g. single digs
+
+    Args:
+        action (Hashable): The action
+
+    Returns:
+        tuple[Hashable, ...]: Just the action
+    """
+    return (action,)
+
+
+def turn_coordinates(turn: Any) -> tuple[Hashable, ...]:
+    """
+    History keys for a search.Turn. Whole turns rarely repeat from one node to the
+    next, but good digs and good destinations do, so each is scored on its own.
+
+    Args:
+        turn (Any): A (dig, move) turn
+
+    Returns:
+        tuple[Hashable, ...]: The dig coordinate and the move's destination, if any
+    """
+    dig, move = turn
+    return ("dig", dig), ("to", move[1] if move is not None else None)
+
+
+class MoveOrdering:
+    """
+    Orders the candidate actions at a search node so that the ones most likely to
+    cause a cutoff are searched first: the principal variation or table move, then
+    the killers for the ply, then by history score, then by a cheap static score.
+
+    One instance is shared by every node of a search, and can be kept between
+    searches so the history carries over. Actions can be digs, moves or whole turns,
+    anything hashable, as long as one instance only ever sees one kind.
+    """
+
+    def __init__(
+        self,
+        killer_slots: int = 2,
+        history_keys: Callable[[Any], Iterable[Hashable]] = whole_action,
+    ):
+        """
+        Args:
+            killer_slots (int, optional): Killers remembered per ply. Defaults to 2.
+            history_keys (Callable[[Any], Iterable[Hashable]], optional): What the
+                history table scores an action by; its history score is the sum over
+                these keys. Must be picklable to go to a worker process. Defaults to
+                the whole action, see turn_coordinates for turns.
+        """
+        self.killer_slots = killer_slots
+        self.history_keys = history_keys
+        # Per ply, the latest actions that caused a cutoff there, newest first
+        self.killers: dict[int, list[Hashable]] = {}
+        # Sum of depth squared over every cutoff an action's keys took part in
+        self.history: dict[Hashable, int] = {}
+
+    def new_search(self):
+        """
+        Forget the killers and halve the history, so old results fade out
+        """
+        self.killers.clear()
+        self.history = {
+            action: score // 2 for action, score in self.history.items() if score > 1
+        }
+
+    def order(
+        self,
+        actions: Iterable[A],
+        ply: int,
+        first: Iterable[A | None] = (),
+        static: Callable[[A], int] | None = None,
+    ) -> list[A]:
+        """
+        Sort actions best first
+
+        Args:
+            actions (Iterable[A]): The legal actions at the node
+            ply (int): The node's distance from the root, for the killers
+            first (Iterable[A | None], optional): Actions to put in front, in the given
+                order, if they are legal, e.g. the PV and table moves. None entries
+                are skipped. Defaults to none.
+            static (Callable[[A], int] | None, optional): Tie-breaker score, higher
+                first. Defaults to none.
+
+        Returns:
+            list[A]: The same actions, reordered
+        """
+        actions = list(actions)
+        legal = set(actions)
+        head: list[A] = []
+        for action in first:
+            if action is not None and action in legal and action not in head:
+                head.append(action)
+        chosen = set(head)
+        killers = self.killers.get(ply, ())
+        history = self.history
+        keys = self.history_keys
+        rest = [action for action in actions if action not in chosen]
+        rest.sort(
+            key=lambda action: (
+                action in killers,
+                sum(history.get(key, 0) for key in keys(action)),
+                static(action) if static is not None else 0,
+            ),
+            reverse=True,
+        )
+        return head + rest
+
+    def cutoff(self, action: Hashable, ply: int, depth: int):
+        """
+        Record that an action caused a beta cutoff
+
+        Args:
+            action (Hashable): The action searched when the cutoff happened
+            ply (int): The node's distance from the root
+            depth (int): The depth left to search at the node
+        """
+        for key in self.history_keys(action):
+            self.history[key] = self.history.get(key, 0) + depth * depth
+        killers = self.killers.setdefault(ply, [])
+        if action in killers:
+            killers.remove(action)
+        killers.insert(0, action)
+        del killers[self.killer_slots :]
+
+
+def enemy_contact(board: Board, color: Space) -> Callable[[Coordinate | None], int]:
+    """
+    Build a static score counting the opponent's pieces next to a coordinate, so digs
+    and moves towards the enemy are tried first. Scores are cached, so the board must
+    not change while the function is in use.
+
+    Args:
+        board (Board): The position at the node
+        color (Space): The player to move
+
+    Returns:
+        Callable[[Coordinate | None], int]: Score per coordinate, 0 for None
+    """
+    enemy = Space.RED if color == Space.BLUE else Space.BLUE
+    cache: dict[Coordinate | None, int] = {None: 0}
+
+    def score(coord: Coordinate | None) -> int:
+        if coord not in cache:
+            cache[coord] = len(board.neighbors(coord, enemy))
+        return cache[coord]
+
+    return score
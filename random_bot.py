@@ -14,7 +14,8 @@ class RandomPlayer:
 
     def mine(self, board: Board, color: Space) -> Coordinate:
         mineable = board.mineable_by_player(color)
-        time.sleep(self.artificial_delay)
+        if self.artificial_delay:
+            time.sleep(self.artificial_delay)
         return choice(tuple(mineable))
 
     def move(self, board: Board, color: Space) -> tuple[Coordinate, Coordinate] | None:
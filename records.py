@@ -0,0 +1,328 @@
+import json
+import struct
+from typing import IO, Iterable, Iterator, NamedTuple
+
+from board import Board, Coordinate, Space, _layout
+
+Move = tuple[Coordinate, Coordinate]
+
+# Start of a binary record file, followed by length-prefixed records
+MAGIC = b"HXGR1\n"
+_FAULTS = (None, "timeout", "crash", "illegal dig", "illegal move")
+_WINNERS = (None, Space.RED, Space.BLUE)
+_NO_CELL = 255  # Cell byte for a missing move; boards have at most 127 cells
+_MAX_MILLIS = 0xFFFF
+
+
+class TurnRecord(NamedTuple):
+    """
+    One completed turn. Turns alternate colors, red first, so the color is implied
+    by the turn's position in the game.
+    """
+
+    dig: Coordinate
+    move: Move | None
+    killed: tuple[Coordinate, ...]  # Enemies removed by clear_dead after the turn
+    seconds: float  # Time the player used for the whole turn
+
+
+class GameRecord(NamedTuple):
+    """
+    Everything needed to replay a game: the board size, who played and every turn
+    """
+
+    small: bool
+    red: str
+    blue: str
+    turns: tuple[TurnRecord, ...]
+    winner: Space | None  # None for a game that was cut short
+    fault: str | None = None  # Why the loser lost early, as in Game.fault
+
+    def color(self, turn: int) -> Space:
+        """
+        Args:
+            turn (int): Index into turns
+
+        Returns:
+            Space: The player who took that turn
+        """
+        return Space.RED if turn % 2 == 0 else Space.BLUE
+
+    def board(self, turn: int | None = None, board_type: type[Board] = Board) -> Board:
+        """
+        Rebuild the position after some number of turns. The recorded kills are
+        applied directly, so the rules aren't rerun.
+
+        Args:
+            turn (int | None, optional): Turns to replay. Defaults to all of them.
+            board_type (type[Board], optional): Board implementation to replay onto.
+                Defaults to Board.
+
+        Returns:
+            Board: The position
+        """
+        board = board_type(self.small)
+        for i, record in enumerate(self.turns[:turn]):
+            _apply(board, self.color(i), record)
+        return board
+
+    def positions(self, board_type: type[Board] = Board) -> Iterator[tuple[Board, Space]]:
+        """
+        Replay the game, yielding the position before each turn with the player to
+        move. The same board is updated in place between yields; copy it to keep it.
+
+        Args:
+            board_type (type[Board], optional): Board implementation to replay onto.
+                Defaults to Board.
+
+        Yields:
+            tuple[Board, Space]: The position and the player about to move
+        """
+        board = board_type(self.small)
+        for i, record in enumerate(self.turns):
+            color = self.color(i)
+            yield board, color
+            _apply(board, color, record)
+
+    def encode(self) -> bytes:
+        """
+        Pack the record into bytes: a cell index byte for every coordinate and the
+        turn time in whole milliseconds, capped at about 65 seconds
+
+        Returns:
+            bytes: The encoded record, see decode()
+        """
+        index = _layout(_size(self.small)).index
+        red, blue = self.red.encode(), self.blue.encode()
+        out = bytearray(
+            struct.pack(
+                "<BBBB",
+                self.small,
+                _WINNERS.index(self.winner),
+                _FAULTS.index(self.fault),
+                len(red),
+            )
+        )
+        out += red
+        out.append(len(blue))
+        out += blue
+        out += struct.pack("<H", len(self.turns))
+        for turn in self.turns:
+            start, end = (
+                (index[turn.move[0]], index[turn.move[1]])
+                if turn.move is not None
+                else (_NO_CELL, _NO_CELL)
+            )
+            out += bytes((index[turn.dig], start, end, len(turn.killed)))
+            out += bytes(index[coord] for coord in turn.killed)
+            out += struct.pack("<H", min(_MAX_MILLIS, round(turn.seconds * 1000)))
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data: bytes) -> "GameRecord":
+        """
+        Args:
+            data (bytes): Output of encode()
+
+        Raises:
+            ValueError: The data is truncated or not a record
+
+        Returns:
+            GameRecord: The record
+        """
+        try:
+            small, winner, fault, length = struct.unpack_from("<BBBB", data)
+            at = 4
+            red = data[at : at + length].decode()
+            at += length
+            length = data[at]
+            blue = data[at + 1 : at + 1 + length].decode()
+            at += 1 + length
+            (count,) = struct.unpack_from("<H", data, at)
+            at += 2
+            axial = _layout(_size(bool(small))).axial
+            turns = []
+            for _ in range(count):
+                dig, start, end, kills = data[at : at + 4]
+                at += 4
+                killed = tuple(axial[i] for i in data[at : at + kills])
+                at += kills
+                (millis,) = struct.unpack_from("<H", data, at)
+                at += 2
+                move = None if start == _NO_CELL else (axial[start], axial[end])
+                turns.append(TurnRecord(axial[dig], move, killed, millis / 1000))
+            return cls(
+                bool(small), red, blue, tuple(turns), _WINNERS[winner], _FAULTS[fault]
+            )
+        except (struct.error, ValueError, IndexError) as e:
+            raise ValueError("Not a valid game record") from e
+
+    def to_json(self) -> dict:
+        """
+        Returns:
+            dict: The record as plain JSON-compatible values, see from_json()
+        """
+        return {
+            "small": self.small,
+            "red": self.red,
+            "blue": self.blue,
+            "winner": None if self.winner is None else self.winner.name.lower(),
+            "fault": self.fault,
+            "turns": [
+                {
+                    "dig": list(turn.dig),
+                    "move": None if turn.move is None else [list(c) for c in turn.move],
+                    "killed": [list(c) for c in turn.killed],
+                    "seconds": turn.seconds,
+                }
+                for turn in self.turns
+            ],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "GameRecord":
+        """
+        Args:
+            data (dict): Output of to_json()
+
+        Returns:
+            GameRecord: The record
+        """
+        turns = tuple(
+            TurnRecord(
+                tuple(turn["dig"]),
+                None if turn["move"] is None else tuple(map(tuple, turn["move"])),
+                tuple(map(tuple, turn["killed"])),
+                turn["seconds"],
+            )
+            for turn in data["turns"]
+        )
+        winner = None if data["winner"] is None else Space[data["winner"].upper()]
+        return cls(data["small"], data["red"], data["blue"], turns, winner, data["fault"])
+
+
+class Recorder:
+    """
+    Collects the turns of a game as it is played, for Game and Simulator
+    """
+
+    def __init__(self, small: bool, red: str, blue: str):
+        self.small = small
+        self.red = red
+        self.blue = blue
+        self.turns: list[TurnRecord] = []
+
+    def add(
+        self,
+        board: Board,
+        dig: Coordinate,
+        move: Move | None,
+        killed: list[Coordinate],
+        seconds: float,
+    ):
+        """
+        Record a completed turn, with its coordinates in axial form
+
+        Args:
+            board (Board): The game's board, for normalizing coordinates
+            dig (Coordinate): Where the player dug
+            move (Move | None): The player's move
+            killed (list[Coordinate]): What clear_dead removed
+            seconds (float): Time the player used
+        """
+        axial = board._layout.axial
+        index = board._index
+        self.turns.append(
+            TurnRecord(
+                axial[index(dig)],
+                None if move is None else (axial[index(move[0])], axial[index(move[1])]),
+                tuple(killed),
+                seconds,
+            )
+        )
+
+    def record(self, winner: Space | None, fault: str | None = None) -> GameRecord:
+        return GameRecord(
+            self.small, self.red, self.blue, tuple(self.turns), winner, fault
+        )
+
+
+def _size(small: bool) -> int:
+    return 5 if small else 7
+
+
+def _apply(board: Board, color: Space, record: TurnRecord):
+    board.apply_dig(record.dig, color)
+    if record.move is not None:
+        board.apply_move(*record.move)
+    for coord in record.killed:
+        board[coord] = Space.EMPTY
+
+
+def write_binary(file: IO[bytes], records: Iterable[GameRecord]):
+    """
+    Write records to a binary file opened with "wb" (or appended to with "ab", if
+    it already starts with MAGIC). Each record is preceded by its length.
+
+    Args:
+        file (IO[bytes]): Where to write
+        records (Iterable[GameRecord]): The games
+    """
+    if file.tell() == 0:
+        file.write(MAGIC)
+    for record in records:
+        data = record.encode()
+        file.write(struct.pack("<I", len(data)))
+        file.write(data)
+
+
+def read_binary(file: IO[bytes]) -> Iterator[GameRecord]:
+    """
+    Read the records written by write_binary()
+
+    Args:
+        file (IO[bytes]): A binary file opened with "rb"
+
+    Raises:
+        ValueError: The file isn't a record file, or is truncated
+
+    Yields:
+        GameRecord: Each record in the file, in order
+    """
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a game record file")
+    while header := file.read(4):
+        if len(header) < 4:
+            raise ValueError("Truncated game record file")
+        (length,) = struct.unpack("<I", header)
+        data = file.read(length)
+        if len(data) < length:
+            raise ValueError("Truncated game record file")
+        yield GameRecord.decode(data)
+
+
+def write_jsonl(file: IO[str], records: Iterable[GameRecord]):
+    """
+    Write records as JSON, one game per line
+
+    Args:
+        file (IO[str]): A text file opened for writing or appending
+        records (Iterable[GameRecord]): The games
+    """
+    for record in records:
+        file.write(json.dumps(record.to_json()) + "\n")
+
+
+def read_jsonl(file: IO[str]) -> Iterator[GameRecord]:
+    """
+    Read the records written by write_jsonl()
+
+    Args:
+        file (IO[str]): A text file opened for reading
+
+    Yields:
+        GameRecord: Each record in the file, in order
+    """
+    for line in file:
+        if line.strip():
+            yield GameRecord.from_json(json.loads(line))
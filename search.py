@@ -0,0 +1,381 @@
+import math
+import time
+from random import Random
+from typing import Callable, Collection, Sequence
+
+from board import Board, Coordinate, Space
+from ordering import MoveOrdering, enemy_contact, turn_coordinates
+from transposition import TranspositionTable, bound_for
+
+Move = tuple[Coordinate, Coordinate]
+# A whole turn: the dig, then the optional move. The dig is None when searching a
+# position where it has already been made.
+Turn = tuple[Coordinate | None, Move | None]
+# Scores a board for `color`, the player who just finished a turn, given how many
+# pieces that player's opponent had before the turn
+Evaluator = Callable[[Board, Space, int], float]
+# Scores many positions at once, with the same meaning as Evaluator. The positions
+# are given as copies of a board's raw cells, all the size of the board passed in.
+BatchEvaluator = Callable[[Board, list[bytes], Space, int], Sequence[float]]
+
+# Larger than any evaluation; a player who can't dig at the start of their turn loses
+WIN = 1e12
+
+_rng = Random("search")
+_SIDE_KEYS = {Space.RED: _rng.getrandbits(64), Space.BLUE: _rng.getrandbits(64)}
+_DUG_KEY = _rng.getrandbits(64)
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside a search when its deadline passes
+    """
+
+
+def other_color(color: Space) -> Space:
+    return Space.RED if color == Space.BLUE else Space.BLUE
+
+
+def legal_moves(board: Board, color: Space) -> list[Move | None]:
+    """
+    Find every move a player can make, including not moving
+
+    Args:
+        board (Board): The board to move on
+        color (Space): The player moving
+
+    Returns:
+        list[Move | None]: None followed by every (start, end) pair
+    """
+    out: list[Move | None] = [None]
+    for piece in board.find_all(color):
+        out.extend((piece, dest) for dest in board.walkable_from_coord(piece))
+    return out
+
+
+def legal_turns(board: Board, color: Space) -> list[Turn]:
+    """
+    Find every dig + move combination a player can make on their turn
+
+    Args:
+        board (Board): The board at the start of the turn. Temporarily modified.
+        color (Space): The player taking the turn
+
+    Returns:
+        list[Turn]: Every legal turn. Empty if the player can't dig and so has lost.
+    """
+    out: list[Turn] = []
+    for dig in board.mineable_by_player(color):
+        undo = board.apply_dig(dig, color)
+        out.extend((dig, move) for move in legal_moves(board, color))
+        board.undo(undo)
+    return out
+
+
+def merge_root_split(
+    results: list[list[tuple[int, Turn | None, float]]],
+) -> Turn | None:
+    """
+    Pick the best turn from iterative deepening searches that each covered a share of
+    the root digs. Scores are only compared at the deepest depth every search finished,
+    except that a search which stopped early because its result was decided counts as
+    finished at any depth.
+
+    Args:
+        results (list[list[tuple[int, Turn | None, float]]]): The completed iterations
+            of each search, as recorded in TurnSearch.completed
+
+    Returns:
+        Turn | None: The best turn, or None if no search finished an iteration
+    """
+    finished = [iterations for iterations in results if iterations]
+    if not finished:
+        return None
+
+    def decided(iterations: list[tuple[int, Turn | None, float]]) -> bool:
+        return abs(iterations[-1][2]) >= WIN / 2
+
+    depth = min(
+        (iterations[-1][0] for iterations in finished if not decided(iterations)),
+        default=math.inf,
+    )
+    candidates = [
+        next(
+            (entry for entry in iterations if entry[0] == depth),
+            iterations[-1],
+        )
+        for iterations in finished
+    ]
+    _, turn, _ = max(
+        (entry for entry in candidates if entry[1] is not None),
+        key=lambda entry: entry[2],
+        default=(0, None, 0.0),
+    )
+    return turn
+
+
+class TurnSearch:
+    """
+    Alpha-beta (negamax) search where one ply is a whole turn: a dig, an optional
+    move and the clear_dead that follows. Boards are searched in place with
+    make/unmake, and results are shared through a transposition table.
+    """
+
+    def __init__(
+        self,
+        evaluate: Evaluator,
+        tt: TranspositionTable | None = None,
+        ordering: MoveOrdering | None = None,
+        evaluate_batch: BatchEvaluator | None = None,
+        batch_after: int = 8,
+    ):
+        """
+        Args:
+            evaluate (Evaluator): Scores leaf positions for the player who just moved
+            tt (TranspositionTable | None, optional): Table to share between searches.
+                A new one is made if None. Defaults to None.
+            ordering (MoveOrdering | None, optional): Killer and history tables to
+                share between searches. A new one is made if None. Defaults to None.
+            evaluate_batch (BatchEvaluator | None, optional): If given, a node one turn
+                from the horizon whose last batch_after children in a row all failed
+                to raise alpha is taken to be an all-node, and scores its remaining
+                children in one call instead of one evaluate call each. Every child
+                in the batch is scored and counted in nodes, even ones a later cutoff
+                would have skipped. Defaults to None.
+            batch_after (int, optional): Children in a row that must fail low before
+                a node batches the rest. Defaults to 8.
+        """
+        self.evaluate = evaluate
+        self.evaluate_batch = evaluate_batch
+        self.batch_after = batch_after
+        self.tt = tt if tt is not None else TranspositionTable()
+        if ordering is None:
+            ordering = MoveOrdering(history_keys=turn_coordinates)
+        self.ordering = ordering
+        self.nodes = 0
+        self.deadline = math.inf
+        # (depth, best turn, score) of each iteration the last iterative_deepening
+        # completed, shallowest first
+        self.completed: list[tuple[int, Turn | None, float]] = []
+        self._pv: list[list[Turn]] = []
+        self._prev_pv: list[Turn] = []
+        self._root_digs: Collection[Coordinate] | None = None
+
+    def iterative_deepening(
+        self,
+        board: Board,
+        color: Space,
+        deadline: float,
+        max_depth: int = 64,
+        dig_done: bool = False,
+        root_digs: Collection[Coordinate] | None = None,
+    ) -> tuple[Turn | None, float, list[Turn], int]:
+        """
+        Search one turn deep, then two, and so on until the deadline, ordering each
+        iteration by the principal variation of the one before
+
+        Args:
+            board (Board): The position to search. Restored before returning.
+            color (Space): The player to move
+            deadline (float): time.monotonic() value at which to stop searching
+            max_depth (int, optional): Stop after completing this depth. Defaults to 64.
+            dig_done (bool, optional): The player has already dug this turn, so only
+                the move is left to choose. Defaults to False.
+            root_digs (Collection[Coordinate] | None, optional): Passed to search.
+                Defaults to None.
+
+        Raises:
+            ValueError: root_digs holds none of the player's legal digs
+
+        Returns:
+            tuple[Turn | None, float, list[Turn], int]: The best turn, its score and the
+                principal variation from the deepest completed iteration, and that depth.
+                If not even depth 1 finishes, the best turn found so far is returned
+                with depth 0.
+        """
+        best: tuple[Turn | None, float, list[Turn], int] = (None, -math.inf, [], 0)
+        self._prev_pv = []
+        self.completed = []
+        try:
+            for depth in range(1, max_depth + 1):
+                turn, score, pv = self.search(
+                    board, color, depth, dig_done, deadline, root_digs
+                )
+                best = (turn, score, pv, depth)
+                self.completed.append((depth, turn, score))
+                self._prev_pv = pv
+                if turn is None or abs(score) >= WIN - max_depth:
+                    break  # Lost, or the result is already decided
+        except SearchTimeout:
+            if best[0] is None and self._pv and self._pv[0]:
+                best = (self._pv[0][0], -math.inf, self._pv[0], 0)
+        finally:
+            self._prev_pv = []
+        if best[0] is None and best[3] == 0:
+            if dig_done:
+                turns: list[Turn] = [(None, None)]
+            else:
+                turns = [
+                    turn
+                    for turn in legal_turns(board, color)
+                    if root_digs is None or turn[0] in root_digs
+                ][:1]
+            if turns:
+                best = (turns[0], -math.inf, turns, 0)
+        return best
+
+    def search(
+        self,
+        board: Board,
+        color: Space,
+        depth: int,
+        dig_done: bool = False,
+        deadline: float = math.inf,
+        root_digs: Collection[Coordinate] | None = None,
+    ) -> tuple[Turn | None, float, list[Turn]]:
+        """
+        Find the best turn for a player
+
+        Args:
+            board (Board): The position to search. Restored before returning.
+            color (Space): The player to move
+            depth (int): How many turns deep to search, at least 1
+            dig_done (bool, optional): The player has already dug this turn, so only
+                the move is left to choose. Defaults to False.
+            deadline (float, optional): time.monotonic() value at which to give up.
+                Defaults to no deadline.
+            root_digs (Collection[Coordinate] | None, optional): Only consider turns
+                starting with one of these digs, so the root can be split between
+                searches running in parallel. Defaults to every dig.
+
+        Raises:
+            SearchTimeout: The deadline passed. The board is still restored.
+            ValueError: root_digs holds none of the player's legal digs
+
+        Returns:
+            tuple[Turn | None, float, list[Turn]]: The best turn (None if the player
+                has lost), its score for the player, and the principal variation
+        """
+        self.nodes = 0
+        self.deadline = deadline
+        self._root_digs = root_digs
+        self._pv = [[] for _ in range(depth + 1)]
+        score = self._negamax(
+            board,
+            color,
+            depth,
+            -math.inf,
+            math.inf,
+            0,
+            board.count_elements(other_color(color)),
+            dig_done,
+            True,
+        )
+        pv = self._pv[0]
+        return (pv[0] if pv else None), score, pv
+
+    def _negamax(
+        self,
+        board: Board,
+        color: Space,
+        depth: int,
+        alpha: float,
+        beta: float,
+        ply: int,
+        prev_enemies: int,
+        dig_done: bool = False,
+        on_pv: bool = False,
+    ) -> float:
+        self.nodes += 1
+        if time.monotonic() > self.deadline:
+            raise SearchTimeout()
+        self._pv[ply] = []
+        if depth == 0:
+            return -self.evaluate(board, other_color(color), prev_enemies)
+        if dig_done:
+            turns: list[Turn] = [(None, move) for move in legal_moves(board, color)]
+        else:
+            turns = legal_turns(board, color)
+        if not turns:
+            return -WIN + ply
+        restricted = ply == 0 and self._root_digs is not None
+        if restricted:
+            turns = [turn for turn in turns if turn[0] in self._root_digs]
+            if not turns:
+                raise ValueError(f"None of the root digs is legal for {color.name}")
+
+        key = board.zobrist_key ^ _SIDE_KEYS[color] ^ (_DUG_KEY if dig_done else 0)
+        score, tt_turn = self.tt.lookup(key, depth, alpha, beta)
+        if score is not None and ply > 0 and tt_turn in turns:
+            return score
+        # Follow the previous iteration's principal variation first, then the table
+        pv_turn = self._prev_pv[ply] if on_pv and ply < len(self._prev_pv) else None
+        contact = enemy_contact(board, color)
+        turns = self.ordering.order(
+            turns,
+            ply,
+            (pv_turn, tt_turn),
+            lambda turn: contact(turn[0]) + (contact(turn[1][1]) if turn[1] else 0),
+        )
+        alpha_orig = alpha
+
+        opponent = other_color(color)
+        enemies = board.count_elements(opponent)
+        best_score = -math.inf
+        best_turn = turns[0]
+        batchable = depth == 1 and self.evaluate_batch is not None
+        leaf_scores: Sequence[float] | None = None
+        batched_from = 0
+        failed_low = 0  # Children in a row that didn't raise alpha
+        for i, turn in enumerate(turns):
+            if leaf_scores is not None:
+                score = float(leaf_scores[i - batched_from])
+            else:
+                undo = board.apply_turn(color, *turn)
+                try:
+                    score = -self._negamax(
+                        board,
+                        opponent,
+                        depth - 1,
+                        -beta,
+                        -alpha,
+                        ply + 1,
+                        enemies,
+                        on_pv=on_pv and turn == pv_turn,
+                    )
+                finally:
+                    board.undo(undo)
+            if score > best_score:
+                best_score = score
+                best_turn = turn
+                self._pv[ply] = [turn] + self._pv[ply + 1]
+            failed_low = failed_low + 1 if score <= alpha else 0
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                self.ordering.cutoff(turn, ply, depth)
+                break
+            if batchable and leaf_scores is None and failed_low >= self.batch_after:
+                # Well-ordered children keep failing low, so this looks like a node
+                # where every child needs a score: get the rest in one call
+                batched_from = i + 1
+                leaf_scores = self._leaf_scores(
+                    board, color, turns[batched_from:], enemies
+                )
+
+        if not restricted:  # A score over some of the turns isn't the position's score
+            self.tt.store(
+                key, depth, best_score, bound_for(best_score, alpha_orig, beta), best_turn
+            )
+        return best_score
+
+    def _leaf_scores(
+        self, board: Board, color: Space, turns: list[Turn], enemies: int
+    ) -> Sequence[float]:
+        # Play each turn just long enough to copy the position, then score them all
+        self.nodes += len(turns)
+        positions = []
+        for turn in turns:
+            undo = board.apply_turn(color, *turn)
+            positions.append(bytes(board._cells))
+            board.undo(undo)
+        return self.evaluate_batch(board, positions, color, enemies)
@@ -0,0 +1,123 @@
+import time
+from copy import copy
+
+from bitboard import BitBoard
+from board import Board, Coordinate, Space
+from game import Player, legal_dig, legal_move
+from records import GameRecord, Recorder
+
+
+class Simulator:
+    """
+    Plays a game with the same rules as Game, but calls the players directly in this
+    process: no worker processes, no clocks and no printing. Meant for self-play,
+    rollouts and statistics, where players are trusted not to hang.
+
+    Players are never given a TurnContext, so clock-aware players fall back to
+    whatever they do without one.
+    """
+
+    def __init__(
+        self,
+        red: Player,
+        blue: Player,
+        small: bool = False,
+        board_type: type[Board] = BitBoard,
+        max_turns: int | None = None,
+    ):
+        """
+        Args:
+            red (Player): The player moving first
+            blue (Player): The player moving second
+            small (bool, optional): Play on the small board. Defaults to False.
+            board_type (type[Board], optional): Board implementation to play on.
+                Defaults to BitBoard.
+            max_turns (int | None, optional): Stop with no winner after this many
+                turns. Defaults to no limit.
+        """
+        self.players = {Space.RED: red, Space.BLUE: blue}
+        self.red_turn = True
+        self.board = board_type(small)
+        self.winner: Space | None = None
+        self.fault: str | None = None
+        self.turn = 0
+        self.max_turns = max_turns
+        self.last_action: dict[
+            Space, tuple[Coordinate, tuple[Coordinate, Coordinate] | None]
+        ] = {}
+        self.recorder = Recorder(small, red.name, blue.name)
+
+    def record(self) -> GameRecord:
+        """
+        Returns:
+            GameRecord: The turns played so far, with the result if the game is over
+        """
+        return self.recorder.record(self.winner, self.fault)
+
+    def step(self):
+        if self.finished:
+            return
+        player_color = Space.RED if self.red_turn else Space.BLUE
+        other_color = Space.BLUE if self.red_turn else Space.RED
+        player = self.players[player_color]
+        # Check if a player just lost by not being able to mine
+        if not self.board.mineable_by_player(player_color):
+            self.winner = other_color
+            return
+        start = time.monotonic()
+        mine_coord = player.mine(copy(self.board), player_color)
+        if not legal_dig(self.board, mine_coord):
+            self.winner, self.fault = other_color, "illegal dig"
+            return
+        self.board.apply_dig(mine_coord, player_color)
+        move = player.move(copy(self.board), player_color)
+        if not legal_move(self.board, player_color, move):
+            self.winner, self.fault = other_color, "illegal move"
+            return
+        if move is not None:
+            self.board.apply_move(*move)
+        seconds = time.monotonic() - start
+        killed = self.board.clear_dead(other_color)
+        self.recorder.add(self.board, mine_coord, move, killed, seconds)
+        self.last_action[player_color] = (mine_coord, move)
+        self.turn += 1
+        self.red_turn = not self.red_turn
+
+    @property
+    def finished(self) -> bool:
+        return self.winner is not None or (
+            self.max_turns is not None and self.turn >= self.max_turns
+        )
+
+    def play_game(self) -> Space | None:
+        """
+        Play until someone wins or max_turns is reached
+
+        Returns:
+            Space | None: The winner, or None if the turn limit was hit first
+        """
+        while not self.finished:
+            self.step()
+        return self.winner
+
+
+def play_many(
+    red: Player, blue: Player, games: int, small: bool = False, **kwargs
+) -> dict[Space | None, int]:
+    """
+    Play a batch of games between the same two players
+
+    Args:
+        red (Player): The player moving first in every game
+        blue (Player): The player moving second in every game
+        games (int): How many games to play
+        small (bool, optional): Play on the small board. Defaults to False.
+        **kwargs: Passed on to Simulator
+
+    Returns:
+        dict[Space | None, int]: Number of wins per color (None for unfinished games)
+    """
+    out: dict[Space | None, int] = {Space.RED: 0, Space.BLUE: 0, None: 0}
+    for _ in range(games):
+        out[Simulator(red, blue, small, **kwargs).play_game()] += 1
+    return out
@@ -0,0 +1,65 @@
+import random
+from copy import copy
+
+import numpy as np
+from batch import BoardBatch, evaluate_positions, random_playouts
+from bitboard import BitBoard
+from board import Board, Space
+from finished_bot import finished_bot
+from random_bot import RandomPlayer
+from simulator import Simulator
+
+
+def _positions(small: bool, games: int) -> list[Board]:
+    random.seed(0)
+    boards = []
+    for _ in range(games):
+        sim = Simulator(RandomPlayer(), RandomPlayer(), small=small, board_type=Board)
+        while not sim.finished:
+            boards.append(copy(sim.board))
+            sim.step()
+    return boards
+
+
+def test_batch_matches_board_rules():
+    for small in (True, False):
+        boards = _positions(small, 3)
+        batch = BoardBatch.from_boards(boards)
+        axial = boards[0]._layout.axial
+        for color in (Space.RED, Space.BLUE):
+            masks = (
+                (batch.mineable_by_player(color.value), Board.mineable_by_player),
+                (batch.walkable(color.value), Board.walkable_by_player),
+            )
+            dead = batch.dead_miners(color.value)
+            for k, board in enumerate(boards):
+                for mask, rule in masks:
+                    assert {axial[i] for i in np.flatnonzero(mask[k])} == rule(
+                        board, color
+                    )
+                assert list(np.flatnonzero(dead[k])) == board._dead_miners(color)
+
+
+def test_batch_evaluation_matches_finished_bot():
+    bot = finished_bot()
+    for small in (True, False):
+        boards = _positions(small, 2)
+        batch = BoardBatch.from_boards(boards)
+        for color in (Space.RED, Space.BLUE):
+            expected = [bot.evaluate(4, BitBoard.from_board(b), color) for b in boards]
+            assert list(batch.evaluate(color.value, 4)) == expected
+        raw = [bytes(b._cells) for b in boards[:5]]
+        assert list(evaluate_positions(boards[0], raw, Space.RED, 4)) == [
+            bot.evaluate(4, b, Space.RED) for b in boards[:5]
+        ]
+
+
+def test_batch_plays_to_the_end():
+    batch = BoardBatch(20, small=True)
+    winners = batch.play(np.random.default_rng(0))
+    assert set(winners) <= {Space.RED.value, Space.BLUE.value}
+    for k, winner in enumerate(winners):
+        # The loser is whoever was to move when the game stopped with no dig
+        loser = Space.RED if winner == Space.BLUE.value else Space.BLUE
+        assert not batch.board(k).mineable_by_player(loser)
+    assert sum(random_playouts(10, small=True, seed=1).values()) == 10
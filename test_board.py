@@ -0,0 +1,146 @@
+import random
+from copy import copy, deepcopy
+
+import pytest
+from bitboard import CheckedBitBoard
+from board import Board, Space
+
+
+@pytest.fixture
+def small_board() -> Board:
+    return Board(small=True)
+
+
+def test_axial_and_cube_coordinates(small_board: Board):
+    b = small_board
+    assert len(b.cells) == 61
+    assert len(Board().cells) == 127
+    b[2, -1] = Space.EMPTY
+    assert b[2, -1, -1] == Space.EMPTY
+    assert (2, -1) in b and (2, -1, -1) in b
+    assert (5, 0) not in b and (1, 1, 1) not in b
+    with pytest.raises(ValueError):
+        b[5, 0] = Space.EMPTY
+    assert b.neighbors((0, 0)) == {(1, -1), (1, 0), (0, 1), (-1, 1), (-1, 0), (0, -1)}
+    assert b.neighbors((4, 0), Space.WALL) == {(4, -1), (3, 0), (3, 1)}
+
+
+def test_copies_are_independent(small_board: Board):
+    b = small_board
+    for c in (copy(b), deepcopy(b)):
+        c[0, 0] = Space.EMPTY
+        assert b[0, 0] == Space.WALL
+        assert c.find_all(Space.RED) == b.find_all(Space.RED)
+
+
+def test_new_boards_start_from_a_fresh_template():
+    b = Board()
+    assert b.count_elements(Space.RED) == b.count_elements(Space.BLUE) == 6
+    assert b.zobrist_key == b._compute_key()
+    b[0, 0] = Space.EMPTY
+    assert Board()[0, 0] == Space.WALL
+
+
+def test_replace_cells(small_board: Board):
+    b = small_board
+    b.cells = {coord: Space.WALL for coord in b.cells}
+    assert b.count_elements(Space.WALL) == 61
+    with pytest.raises(ValueError):
+        b.cells = {(0, 0, 0): Space.EMPTY}
+
+
+def test_bitboard_matches_set_rules():
+    rng = random.Random(0)
+    for small in (True, False):
+        b = CheckedBitBoard(small)
+        color, other = Space.RED, Space.BLUE
+        for _ in range(40):
+            mineable = b.mineable_by_player(color)
+            if not mineable:
+                break
+            b[rng.choice(sorted(mineable))] = Space.EMPTY
+            b.walkable_by_player(color)
+            for piece in b.find_all(color):
+                b.walkable_from_coord(piece)
+                b.is_miner_dead(piece)
+            b.clear_dead(other)
+            color, other = other, color
+
+
+def test_walking_between_regions(small_board: Board):
+    b = small_board
+    b.cells = {coord: Space.WALL for coord in b.cells}
+    # Two tunnels joined by a pair of red pieces, with a blue piece closing a third
+    for coord in [(-2, 0), (-1, 0), (2, 0), (3, 0), (0, 1)]:
+        b[coord] = Space.EMPTY
+    b[0, 0] = b[1, 0] = Space.RED
+    b[0, 2] = Space.BLUE
+    assert b.walkable_from_coord((0, 0)) == {(-2, 0), (-1, 0), (2, 0), (3, 0), (0, 1)}
+    assert b.walkable_by_player(Space.BLUE) == {(0, 1)}
+    assert b.is_miner_dead((0, 2))  # it reaches both reds and no friend
+    # Writes drop the cached regions: without the second red the tunnels split
+    b[1, 0] = Space.WALL
+    assert b.walkable_from_coord((0, 0)) == {(-2, 0), (-1, 0), (0, 1)}
+    assert b.walkable_from_coord((3, 0)) == {(2, 0), (3, 0)}
+
+
+def test_apply_turn_and_undo(small_board: Board):
+    b = small_board
+    b.cells = {coord: Space.WALL for coord in b.cells}
+    for coord in [(0, 0), (0, -1), (1, 0)]:
+        b[coord] = Space.EMPTY
+    b[1, -1] = Space.RED
+    b[-1, 1] = Space.BLUE
+    b[1, 1] = Space.RED
+    before = copy(b)
+    undo = b.apply_turn(Space.RED, (-1, 0), ((1, -1), (0, -1)))
+    assert b[-1, 0] == Space.RED  # red had fewer than 3 miners, so the dig spawns one
+    assert b[0, -1] == Space.RED and b[1, -1] == Space.EMPTY
+    assert b[-1, 1] == Space.EMPTY  # blue is cut off and touching two reds
+    b.undo(undo)
+    assert dict(b.cells) == dict(before.cells)
+
+
+def test_clear_dead_spares_miners_sharing_a_pocket(small_board: Board):
+    b = small_board
+    b.cells = {coord: Space.WALL for coord in b.cells}
+    for coord in [(-1, 0), (0, 0), (1, 0), (2, 0)]:
+        b[coord] = Space.EMPTY
+    b[-2, 0] = b[3, 0] = Space.BLUE
+    b[0, 1] = b[2, -1] = Space.RED  # Two reds reaching the same pocket
+    b[0, -2] = Space.RED  # A third red, shut in with nothing
+    b.clear_dead(Space.BLUE)
+    assert b.count_elements(Space.BLUE) == 2
+    b.clear_dead(Space.RED)
+    assert b.find_all(Space.RED) == {(0, 1), (2, -1), (0, -2)}
+    b[2, -1] = Space.EMPTY
+    b.clear_dead(Space.RED)
+    assert b.find_all(Space.RED) == {(0, -2)}
+
+
+def test_mineable_walls_follow_digs_and_undo(small_board: Board):
+    b = small_board
+    before = b.mineable_by_player(Space.RED)
+    b.mineable_by_player(Space.RED).clear()  # answers are copies of the cache
+    assert b.mineable_by_player(Space.RED) == before
+    dig = sorted(before)[0]
+    undo = b.apply_dig(dig, Space.RED)
+    rule = {c for c in b.find_all(Space.WALL) if b._is_mineable(b._index(c))}
+    assert {c for c in b.find_all(Space.WALL) if b.is_mineable(c)} == rule
+    b.undo(undo)
+    assert b.mineable_by_player(Space.RED) == before
+
+
+def test_zobrist_key_is_incremental(small_board: Board):
+    b = small_board
+    start = b.zobrist_key
+    assert start == b._compute_key() == copy(b).zobrist_key
+    assert hash(b) == hash(start)
+    a, c = sorted(b.mineable_by_player(Space.RED))[:2]
+    undo = b.apply_dig(a, Space.EMPTY) + b.apply_dig(c, Space.EMPTY)
+    other = Board(small=True)
+    other.apply_dig(c, Space.EMPTY)
+    other.apply_dig(a, Space.EMPTY)
+    assert b.zobrist_key == other.zobrist_key == b._compute_key() != start
+    b.undo(undo)
+    assert b.zobrist_key == start
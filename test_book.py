@@ -0,0 +1,36 @@
+import io
+
+import pytest
+
+from board import Board, Space
+from book import OpeningBook, build
+from finished_bot import finished_bot
+
+
+def test_build_covers_the_opening_and_round_trips():
+    book = build(small=True, plies=2, depth=1, width=2)
+    # The start position, then the positions after red's two followed turns
+    assert len(book) == 3
+    board = Board(small=True)
+    turn = book.lookup(board, Space.RED)
+    assert turn is not None and book.lookup(board, Space.BLUE) is None
+
+    data = io.BytesIO()
+    book.write(data)
+    data.seek(0)
+    assert OpeningBook.read(data).entries == book.entries
+    with pytest.raises(ValueError):
+        OpeningBook.read(io.BytesIO(data.getvalue()[:-1]))
+
+    bot = finished_bot(book=book)
+    assert bot.mine(board, Space.RED) == turn[0]
+    board.apply_dig(turn[0], Space.RED)
+    assert bot.move(board, Space.RED) == turn[1]
+
+
+def test_lookup_rejects_illegal_turns():
+    book = OpeningBook()
+    board = Board(small=True)
+    # Same key as the start position, but not a dig red can make there
+    book.add(board, Space.RED, ((-2, 0), None))
+    assert book.lookup(board, Space.RED) is None
@@ -0,0 +1,64 @@
+import numpy as np
+
+from board import Space
+from dataset import (
+    FEATURES,
+    HAND_WEIGHTS,
+    POSITION,
+    append,
+    fit_scale,
+    load,
+    loss,
+    positions,
+    tune,
+)
+from finished_bot import finished_bot
+from random_bot import RandomPlayer
+from simulator import Simulator
+
+
+def test_positions_are_memory_mapped(tmp_path):
+    sim = Simulator(RandomPlayer(), RandomPlayer(), small=True)
+    sim.play_game()
+    record = sim.record()
+    path = str(tmp_path / "positions.bin")
+    assert append(path, [record] * 2) == 2 * sim.turn
+    data = load(path)
+    assert isinstance(data, np.memmap) and len(data) == 2 * sim.turn
+    first = data[0]
+    board = record.board(1)
+    assert first["cells"][: len(board._cells)].tobytes() == bytes(board._cells)
+    assert first["color"] == Space.RED.value and first["small"]
+    assert set(data["result"][: sim.turn : 2]) == {float(sim.winner == Space.RED)}
+
+
+def test_hand_weights_reproduce_finished_bot():
+    sim = Simulator(RandomPlayer(), RandomPlayer(), small=False)
+    sim.play_game()
+    record = sim.record()
+    rows = positions(record)
+    bot = finished_bot()
+    for i, row in enumerate(rows):
+        if not row["features"][0] or not row["features"][1]:
+            continue  # Decided, so evaluate adds its +-1e9 terms
+        color = record.color(i)
+        other = Space.RED if color == Space.BLUE else Space.BLUE
+        prev_enemies = record.board(i).count_elements(other)
+        expected = bot.evaluate(prev_enemies, record.board(i + 1), color)
+        assert float(row["features"] @ HAND_WEIGHTS) == expected
+
+
+def test_tune_recovers_weights():
+    rng = np.random.default_rng(0)
+    data = np.zeros(20000, dtype=POSITION)
+    x = rng.integers(0, 10, size=(len(data), len(FEATURES))).astype(np.float32)
+    true = np.array([30.0, -50.0, 300.0, 100.0, 10.0])
+    p = 1 / (1 + np.exp(-0.002 * (x @ true)))
+    data["features"] = x
+    data["result"] = rng.random(len(data)) < p
+    scale = fit_scale(data, true)
+    assert 0.001 < scale < 0.004
+    start = np.ones(len(FEATURES))
+    weights = tune(data, start, scale=0.002, chunk=4096)
+    assert np.allclose(weights, true, atol=25)
+    assert loss(data, weights, 0.002) < loss(data, start, 0.002)
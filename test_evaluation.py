@@ -0,0 +1,35 @@
+from random import Random
+
+from bitboard import BitBoard
+from board import Board, Space
+from evaluation import IncrementalEvaluator
+from finished_bot import finished_bot
+from search import legal_turns, other_color
+
+
+def test_matches_full_evaluation_through_play_and_undo():
+    rng = Random(0)
+    bot = finished_bot()
+    board = BitBoard.from_board(Board(small=True))
+    evaluator = IncrementalEvaluator(board)
+    color = Space.RED
+    undo = []
+    for _ in range(20):
+        turns = legal_turns(board, color)
+        if not turns:
+            break
+        undo.append(board.apply_turn(color, *rng.choice(turns)))
+        color = other_color(color)
+        for side in (Space.RED, Space.BLUE):
+            expected = bot.evaluate(6, BitBoard.from_board(board), side)
+            assert evaluator.evaluate(side, 6) == expected
+    for record in reversed(undo):
+        board.undo(record)
+    fresh = IncrementalEvaluator(BitBoard.from_board(board))
+    assert (evaluator.pieces, evaluator.contacts, evaluator.open_sides) == (
+        fresh.pieces,
+        fresh.contacts,
+        fresh.open_sides,
+    )
+    evaluator.detach()
+    assert board._watchers == ()
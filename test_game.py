@@ -1,7 +1,8 @@
 import pytest
-from board import Space
-from game import Game
+from board import Board, Coordinate, Space
+from game import Game, TurnContext
 from random_bot import RandomPlayer
+from simulator import Simulator
 
 
 @pytest.fixture
@@ -49,3 +50,58 @@ def test_reserve_time(time_reserve_game: Game):
     g = time_reserve_game
     g.step()
     assert g.reserve_time[Space.RED] == pytest.approx(1.5, abs=0.01)
+
+
+class ContextChecker(RandomPlayer):
+    """
+    Runs in the game's worker process, so it checks the context there and crashes
+    (losing the game) if anything is off
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.context: TurnContext | None = None
+        self.turns_seen = 0
+
+    def begin_turn(self, context: TurnContext):
+        self.context = context
+
+    def mine(self, board: Board, color: Space) -> Coordinate:
+        c = self.context
+        assert not c.dig_done and c.time_left == 3.0 and c.time_per_move == 1.0
+        assert c.turn == 2 * self.turns_seen + (color == Space.BLUE)
+        assert (c.opponent_last_action is None) == (c.turn == 0)
+        self.turns_seen += 1
+        return super().mine(board, color)
+
+    def move(self, board: Board, color: Space) -> tuple[Coordinate, Coordinate] | None:
+        assert self.context.dig_done and self.context.time_left <= 3.0
+        return super().move(board, color)
+
+
+def test_turn_context_and_persistent_players():
+    with Game(
+        ContextChecker(), ContextChecker(), small=True, time_per_move=1.0, reserve_time=2.0
+    ) as g:
+        for _ in range(4):
+            g.step()
+        assert g.winner is None and g.turn == 4
+
+
+def test_simulator_plays_to_a_winner():
+    sim = Simulator(RandomPlayer(), RandomPlayer(), small=True)
+    winner = sim.play_game()
+    assert winner in (Space.RED, Space.BLUE) and sim.fault is None
+    assert not sim.board.mineable_by_player(
+        Space.RED if winner == Space.BLUE else Space.BLUE
+    )
+
+
+def test_simulator_rejects_illegal_dig():
+    class Cheater(RandomPlayer):
+        def mine(self, board: Board, color: Space) -> Coordinate:
+            return (99, 99)
+
+    sim = Simulator(Cheater(), RandomPlayer(), small=True)
+    sim.step()
+    assert sim.winner == Space.BLUE and sim.fault == "illegal dig"
@@ -0,0 +1,30 @@
+import math
+
+from board import Board, Space
+from geometry import distance, geometry, nearest_enemy, nearest_teammate
+
+
+def test_tables_match_distance():
+    geo = geometry(Board(small=True).size)
+    coords = geo.axial
+    for a in coords[::5]:
+        for b in coords:
+            assert geo.distance(a, b) == distance(a, b)
+    ring = geo.ring((0, 0), 1)
+    assert sorted(ring) == sorted(c for c in coords if distance(c, (0, 0)) == 1)
+    assert len(ring) == 6 and geo.ring((0, 0), 99) == []
+
+
+def test_nearest_pieces():
+    board = Board(small=True)
+    reds = sorted(board.find_all(Space.RED))
+    blues = sorted(board.find_all(Space.BLUE))
+    assert nearest_teammate(board, Space.RED) == min(
+        distance(a, b) for a in reds for b in reds if a != b
+    )
+    assert nearest_enemy(board, Space.RED) == min(
+        distance(a, b) for a in reds for b in blues
+    )
+    for coord in blues:
+        board[coord] = Space.EMPTY
+    assert nearest_enemy(board, Space.RED) == math.inf
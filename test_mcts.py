@@ -0,0 +1,33 @@
+from board import Board, Space
+from game import legal_dig, legal_move
+from mcts import MCTS, best_turn
+from mcts_bot import MCTSPlayer
+from search import legal_turns
+
+
+def test_tree_is_reused_from_mine_to_move():
+    board = Board(small=True)
+    tree = MCTS(seed=0)
+    stats = tree.search(board, Space.RED, iterations=200)
+    assert board.zobrist_key == Board(small=True).zobrist_key
+    assert sum(visits for visits, _ in stats.values()) == 200
+    dig, move = best_turn(stats)
+    assert (dig, move) in legal_turns(board, Space.RED)
+    kept = sum(visits for (d, _), (visits, _) in stats.items() if d == dig)
+
+    board.apply_dig(dig, Space.RED)
+    stats = tree.search(board, Space.RED, dig_done=True, iterations=50)
+    assert tree.root.dig_done and tree.root.visits == kept + 50
+    assert all(d is None for d, _ in stats)
+
+
+def test_root_parallel_player():
+    board = Board(small=True)
+    player = MCTSPlayer(iterations=30, workers=2, seed=0)
+    dig = player.mine(board, Space.BLUE)
+    assert legal_dig(board, dig)
+    assert player.tree.iterations == 30
+    board.apply_dig(dig, Space.BLUE)
+    assert legal_move(board, Space.BLUE, player.move(board, Space.BLUE))
+    for helper in player.helpers:
+        helper.close()
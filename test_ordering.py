@@ -0,0 +1,35 @@
+from board import Board, Space
+from ordering import MoveOrdering, enemy_contact, turn_coordinates
+
+
+def test_order_priorities():
+    ordering = MoveOrdering()
+    ordering.cutoff("history", ply=3, depth=4)
+    ordering.cutoff("killer", ply=1, depth=1)
+    actions = ["plain", "static", "killer", "history", "pv"]
+    ordered = ordering.order(
+        actions, ply=1, first=(None, "pv", "illegal"), static=lambda a: a == "static"
+    )
+    assert ordered == ["pv", "killer", "history", "static", "plain"]
+    # Killers belong to their ply; history is shared by every ply
+    assert ordering.order(actions, ply=2)[:2] == ["history", "killer"]
+
+    ordering.new_search()
+    assert ordering.killers == {} and ordering.history == {"history": 8}
+
+
+def test_enemy_contact():
+    board = Board(small=True)
+    contact = enemy_contact(board, Space.RED)
+    # (-1, 3) holds a blue piece, so its neighbors touch one enemy
+    assert contact((-1, 2)) == 1
+    assert contact((0, 0)) == 0 and contact(None) == 0
+
+
+def test_turn_history_is_keyed_by_coordinates():
+    ordering = MoveOrdering(history_keys=turn_coordinates)
+    ordering.cutoff(((0, 0), ((1, 1), (2, 2))), ply=5, depth=3)
+    # A different turn sharing the dig, and one sharing the destination, both gain
+    turns = [((4, 4), None), ((0, 0), None), ((3, 3), ((1, 2), (2, 2)))]
+    assert ordering.order(turns, ply=0)[2] == ((4, 4), None)
+    assert ordering.history[("dig", (0, 0))] == ordering.history[("to", (2, 2))] == 9
@@ -0,0 +1,38 @@
+import io
+
+from board import Board
+from random_bot import RandomPlayer
+from records import GameRecord, read_binary, read_jsonl, write_binary, write_jsonl
+from simulator import Simulator
+
+
+def played(small: bool) -> tuple[Simulator, GameRecord]:
+    sim = Simulator(RandomPlayer(), RandomPlayer(), small=small, board_type=Board)
+    sim.play_game()
+    record = sim.record()
+    # Encoded times are whole milliseconds
+    turns = tuple(t._replace(seconds=round(t.seconds, 3)) for t in record.turns)
+    return sim, record._replace(turns=turns)
+
+
+def test_replay_rebuilds_every_position():
+    sim, record = played(small=True)
+    assert record.winner == sim.winner and len(record.turns) == sim.turn
+    assert any(turn.killed for turn in record.turns) or sim.turn < 10
+    assert dict(record.board().cells) == dict(sim.board.cells)
+    positions = [(board.zobrist_key, color) for board, color in record.positions()]
+    assert positions[3] == (record.board(3).zobrist_key, record.color(3))
+
+
+def test_binary_and_jsonl_round_trips():
+    records = [played(small)[1] for small in (True, False)]
+    binary = io.BytesIO()
+    write_binary(binary, records)
+    binary.seek(0)
+    assert list(read_binary(binary)) == records
+    # A cell byte per coordinate keeps a game well under a kilobyte
+    assert len(records[1].encode()) < 8 * len(records[1].turns) + 32
+    text = io.StringIO()
+    write_jsonl(text, records)
+    text.seek(0)
+    assert list(read_jsonl(text)) == records
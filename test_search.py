@@ -0,0 +1,77 @@
+import math
+import time
+from copy import copy
+
+import pytest
+
+from board import Board, Space
+from search import TurnSearch, legal_turns, merge_root_split
+
+
+def count_pieces(board: Board, color: Space, prev_enemies: int) -> float:
+    other = Space.RED if color == Space.BLUE else Space.BLUE
+    return board.count_elements(color) - board.count_elements(other)
+
+
+def test_search_restores_board():
+    board = Board(small=True)
+    key = board.zobrist_key
+    turn, _, pv = TurnSearch(count_pieces).search(board, Space.RED, 2)
+    assert board.zobrist_key == key
+    assert turn in legal_turns(board, Space.RED)
+    assert pv[0] == turn and len(pv) == 2
+
+
+def test_iterative_deepening_stops_at_deadline():
+    board = Board()
+    start = time.monotonic()
+    turn, _, _, depth = TurnSearch(count_pieces).iterative_deepening(
+        board, Space.BLUE, start + 0.3
+    )
+    assert time.monotonic() - start < 1.0
+    assert depth >= 1
+    assert turn in legal_turns(board, Space.BLUE)
+    assert board.zobrist_key == Board().zobrist_key
+
+
+def test_batched_leaves_match_single_evaluation():
+    def count_many(board: Board, positions: list[bytes], color: Space, prev: int):
+        scratch = copy(board)
+        out = []
+        for cells in positions:
+            scratch.__setstate__((board.size, board.miner_count, cells))
+            out.append(count_pieces(scratch, color, prev))
+        return out
+
+    board = Board(small=True)
+    for depth in (1, 2, 3):
+        plain = TurnSearch(count_pieces)
+        result = plain.search(board, Space.BLUE, depth)
+        for batch_after in (1, 8):
+            batched = TurnSearch(
+                count_pieces, evaluate_batch=count_many, batch_after=batch_after
+            )
+            assert batched.search(board, Space.BLUE, depth) == result
+            # Batched leaves are counted even where the plain search cut off early
+            assert batched.nodes >= plain.nodes
+
+
+def test_root_split_matches_full_search():
+    board = Board(small=True)
+    _, full_score, _ = TurnSearch(count_pieces).search(board, Space.RED, 2)
+    digs = sorted(board.mineable_by_player(Space.RED))
+    results = []
+    for share in (digs[::2], digs[1::2]):
+        searcher = TurnSearch(count_pieces)
+        searcher.iterative_deepening(
+            board, Space.RED, math.inf, max_depth=2, root_digs=share
+        )
+        assert [depth for depth, _, _ in searcher.completed] == [1, 2]
+        assert all(turn[0] in share for _, turn, _ in searcher.completed)
+        results.append(searcher.completed)
+    assert max(iterations[-1][2] for iterations in results) == full_score
+    assert merge_root_split(results) in legal_turns(board, Space.RED)
+    # Digs that aren't legal here leave nothing to search
+    with pytest.raises(ValueError):
+        TurnSearch(count_pieces).search(board, Space.RED, 2, root_digs=[(99, 99)])
+    assert board.zobrist_key == Board(small=True).zobrist_key
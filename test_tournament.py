@@ -0,0 +1,33 @@
+from tournament import GameResult, gauntlet, round_robin, standings
+
+
+def result(red: str, blue: str, winner: str, fault: str | None = None) -> GameResult:
+    return GameResult(red, blue, True, winner, 10, fault, 1.0, 5, 2.0, 5)
+
+
+def test_schedules_swap_colors():
+    schedule = round_robin(["a", "b", "c"], games=2, sizes=(True, False))
+    assert len(schedule) == 3 * 2 * 2 * 2
+    assert sum(s.red == "a" and s.blue == "b" for s in schedule) == 4
+    assert sum(s.red == "b" and s.blue == "a" for s in schedule) == 4
+    assert {s.blue for s in gauntlet("a", ["a", "b", "c"]) if s.red == "a"} == {"b", "c"}
+
+
+def test_standings():
+    results = [result("a", "b", "a") for _ in range(6)] + [
+        result("b", "a", "b", "timeout"),
+        result("c", "b", "b"),
+        result("b", "c", "c"),
+    ]
+    rows = {s.name: s for s in standings(results, bootstrap=50)}
+    assert rows["a"].elo > rows["b"].elo
+    assert rows["a"].elo_low <= rows["a"].elo <= rows["a"].elo_high
+    assert rows["a"].wins == 6 and rows["a"].games == 7
+    assert rows["a"].timeouts == 1 and rows["a"].faults == 1
+    assert rows["a"].avg_move_time == (6 * 1.0 + 2.0) / 35
+    assert abs(sum(s.elo for s in rows.values())) < 1e-6
+
+
+def test_one_sided_results_still_have_an_interval():
+    rows = {s.name: s for s in standings([result("a", "b", "a")] * 2, bootstrap=200)}
+    assert rows["a"].elo_low < rows["a"].elo < rows["a"].elo_high
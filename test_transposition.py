@@ -0,0 +1,48 @@
+import tracemalloc
+
+from transposition import EXACT, LOWER, UPPER, TranspositionTable, bound_for
+
+
+def test_lookup_respects_depth_and_bounds():
+    tt = TranspositionTable(0.01)
+    turn = ((1, 2), ((-6, 3), (0, 0)))
+    tt.store(12345, 3, 10.0, LOWER, turn)
+    assert tt.lookup(12345, 3, 0, 5) == (10.0, turn)  # fails high
+    assert tt.lookup(12345, 3, 0, 20) == (None, turn)  # inside the window
+    assert tt.lookup(12345, 4, 0, 5) == (None, turn)  # too shallow
+    assert tt.lookup(54321, 1, 0, 5) == (None, None)
+    # Turns without a dig or a move survive packing
+    tt.store(12345, 3, 10.0, EXACT, (None, None))
+    assert tt.probe(12345).move == (None, None)
+    tt.store(12345, 3, 10.0, EXACT, ((6, -6), None))
+    assert tt.probe(12345).move == ((6, -6), None)
+    assert bound_for(-1, 0, 5) == UPPER and bound_for(3, 0, 5) == EXACT
+
+
+def test_depth_preferred_slot_survives_shallow_stores():
+    tt = TranspositionTable(0.0001)
+    deep = 7
+    collisions = [deep + k * tt.buckets for k in range(1, 4)]
+    tt.store(deep, 5, 1.0, EXACT)
+    for key in collisions:
+        tt.store(key, 1, 2.0, EXACT)
+    assert tt.probe(deep) is not None
+    assert tt.probe(collisions[-1]) is not None
+    assert tt.probe(collisions[0]) is None
+    tt.new_search()
+    tt.store(collisions[0], 1, 3.0, EXACT)
+    assert tt.probe(collisions[0]).score == 3.0
+    assert len(tt) == 2
+
+
+def test_full_table_stays_within_budget():
+    tracemalloc.start()
+    try:
+        tt = TranspositionTable(1)
+        for key in range(2 * tt.buckets):
+            tt.store(key, 1, 0.5, EXACT, ((key % 5, 1), ((0, 0), (1, -1))))
+        used = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(tt) == 2 * tt.buckets
+    assert used <= 1.05 * 2**20
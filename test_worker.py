@@ -0,0 +1,92 @@
+import os
+import time
+
+import pytest
+
+from board import Board, Coordinate, Space
+from game import Game, TurnContext
+from random_bot import RandomPlayer
+from worker import PlayerCrashed, PlayerWorker
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def count(self) -> int:
+        self.calls += 1
+        return self.calls
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+    def fail(self):
+        raise RuntimeError("boom")
+
+    def exit(self):
+        os._exit(1)
+
+
+def test_timeout_kills_and_restarts_the_worker():
+    worker = PlayerWorker(Counter())
+    try:
+        assert worker.call("count", (), 5.0)[0] == 1
+        assert worker.call("count", (), 5.0)[0] == 2  # State kept between calls
+        with pytest.raises(TimeoutError):
+            worker.call("sleep", (5.0,), 0.1)
+        # A fresh copy of the original player
+        assert worker.call("count", (), 5.0)[0] == 1
+    finally:
+        worker.close()
+
+
+def test_crashes_become_player_crashed():
+    worker = PlayerWorker(Counter())
+    try:
+        with pytest.raises(PlayerCrashed, match="boom"):
+            worker.call("fail", (), 5.0)
+        assert worker.call("count", (), 5.0)[0] == 1
+        with pytest.raises(PlayerCrashed, match="died"):
+            worker.call("exit", (), 5.0)
+        assert worker.call("count", (), 5.0)[0] == 1
+    finally:
+        worker.close()
+
+
+class SlowStarter(RandomPlayer):
+    def begin_turn(self, context: TurnContext):
+        time.sleep(0.3)
+
+
+class Exiter(RandomPlayer):
+    def mine(self, board: Board, color: Space) -> Coordinate:
+        os._exit(1)
+
+
+def test_begin_turn_is_charged_to_the_player():
+    with Game(
+        SlowStarter(), RandomPlayer(), small=True, time_per_move=0.2, reserve_time=2.0
+    ) as g:
+        g.step()
+        # begin_turn runs before both mine and move
+        assert g.move_times[Space.RED][0] >= 0.6
+        assert g.reserve_time[Space.RED] < 2.0 - 0.35
+
+
+def test_dead_worker_loses_the_game():
+    with Game(Exiter(), RandomPlayer(), small=True) as g:
+        g.step()
+        assert g.winner == Space.BLUE and g.fault == "crash"
+
+
+def test_result_limits_only_the_wait():
+    worker = PlayerWorker(Counter())
+    try:
+        worker.submit("sleep", (0.3,))
+        time.sleep(0.4)
+        # Ran longer than the timeout in total, but the answer is already here
+        assert worker.result(0.0)[1] >= 0.3
+        with pytest.raises(TimeoutError):
+            worker.call("sleep", (0.3,), 0.05)
+    finally:
+        worker.close()
@@ -0,0 +1,404 @@
+import argparse
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, NamedTuple
+
+from board import Space
+from game import Game, Player
+from records import GameRecord, write_binary
+from simulator import Simulator
+
+PlayerFactory = Callable[[], Player]
+
+
+class MatchSpec(NamedTuple):
+    red: str
+    blue: str
+    small: bool
+
+
+class GameResult(NamedTuple):
+    red: str
+    blue: str
+    small: bool
+    winner: str
+    turns: int
+    fault: str | None  # Set when the loser timed out, crashed or played illegally
+    red_seconds: float
+    red_turns: int
+    blue_seconds: float
+    blue_turns: int
+    record: GameRecord | None = None  # Every turn, with the players named as entrants
+
+    @property
+    def loser(self) -> str:
+        return self.blue if self.winner == self.red else self.red
+
+
+class Standing(NamedTuple):
+    name: str
+    games: int
+    wins: int
+    win_rate: float
+    elo: float
+    elo_low: float  # 95% interval from resampling each pairing, see standings()
+    elo_high: float
+    avg_move_time: float  # Seconds per turn, dig and move together
+    timeouts: int
+    faults: int  # Timeouts, crashes and illegal moves
+
+
+def round_robin(
+    names: list[str], games: int = 1, sizes: tuple[bool, ...] = (True, False)
+) -> list[MatchSpec]:
+    """
+    Schedule every entrant against every other, on each board size, with each
+    entrant playing both colors
+
+    Args:
+        names (list[str]): The entrants
+        games (int, optional): Games per pairing, color and size. Defaults to 1.
+        sizes (tuple[bool, ...], optional): Values of Game's small flag to play on.
+            Defaults to both sizes.
+
+    Returns:
+        list[MatchSpec]: The games to play
+    """
+    return [
+        spec
+        for i, a in enumerate(names)
+        for b in names[i + 1 :]
+        for spec in _pairing(a, b, games, sizes)
+    ]
+
+
+def gauntlet(
+    challenger: str,
+    opponents: list[str],
+    games: int = 1,
+    sizes: tuple[bool, ...] = (True, False),
+) -> list[MatchSpec]:
+    """
+    Schedule one entrant against each of the others, on each board size, with both
+    color assignments
+
+    Args:
+        challenger (str): The entrant being evaluated
+        opponents (list[str]): The entrants it plays against
+        games (int, optional): Games per opponent, color and size. Defaults to 1.
+        sizes (tuple[bool, ...], optional): Values of Game's small flag to play on.
+            Defaults to both sizes.
+
+    Returns:
+        list[MatchSpec]: The games to play
+    """
+    return [
+        spec
+        for opponent in opponents
+        if opponent != challenger
+        for spec in _pairing(challenger, opponent, games, sizes)
+    ]
+
+
+def _pairing(
+    a: str, b: str, games: int, sizes: tuple[bool, ...]
+) -> list[MatchSpec]:
+    return [
+        MatchSpec(red, blue, small)
+        for small in sizes
+        for _ in range(games)
+        for red, blue in ((a, b), (b, a))
+    ]
+
+
+def play_match(
+    spec: MatchSpec,
+    entrants: dict[str, PlayerFactory],
+    time_per_move: float,
+    reserve_time: float,
+    simulate: bool = False,
+) -> GameResult:
+    """
+    Play one game to completion. Runs inside a tournament worker process.
+    """
+    if simulate:
+        sim = Simulator(entrants[spec.red](), entrants[spec.blue](), small=spec.small)
+        winner = sim.play_game()
+        return GameResult(
+            red=spec.red,
+            blue=spec.blue,
+            small=spec.small,
+            winner=spec.red if winner == Space.RED else spec.blue,
+            turns=sim.turn,
+            fault=sim.fault,
+            red_seconds=0.0,
+            red_turns=(sim.turn + 1) // 2,
+            blue_seconds=0.0,
+            blue_turns=sim.turn // 2,
+            record=sim.record()._replace(red=spec.red, blue=spec.blue),
+        )
+    game = Game(
+        entrants[spec.red](),
+        entrants[spec.blue](),
+        small=spec.small,
+        time_per_move=time_per_move,
+        reserve_time=reserve_time,
+    )
+    winner = game.play_game()
+    return GameResult(
+        red=spec.red,
+        blue=spec.blue,
+        small=spec.small,
+        winner=spec.red if winner == Space.RED else spec.blue,
+        turns=game.turn,
+        fault=game.fault,
+        red_seconds=sum(game.move_times[Space.RED]),
+        red_turns=len(game.move_times[Space.RED]),
+        blue_seconds=sum(game.move_times[Space.BLUE]),
+        blue_turns=len(game.move_times[Space.BLUE]),
+        record=game.record()._replace(red=spec.red, blue=spec.blue),
+    )
+
+
+def run_tournament(
+    entrants: dict[str, PlayerFactory],
+    schedule: list[MatchSpec],
+    time_per_move: float = 3.0,
+    reserve_time: float = 10.0,
+    workers: int | None = None,
+    progress: bool = False,
+    simulate: bool = False,
+) -> list[GameResult]:
+    """
+    Play every scheduled game, spread across a pool of processes
+
+    Args:
+        entrants (dict[str, PlayerFactory]): Picklable zero-argument callables that
+            build each entrant's player, e.g. the player classes themselves
+        schedule (list[MatchSpec]): The games to play
+        time_per_move (float, optional): Passed to Game. Defaults to 3.0.
+        reserve_time (float, optional): Passed to Game. Defaults to 10.0.
+        workers (int | None, optional): Games played at once. Defaults to one per CPU.
+            Each game's players run in their own processes, but only one of them
+            thinks at a time.
+        progress (bool, optional): Print a line as each game finishes. Defaults to False.
+        simulate (bool, optional): Play in-process with Simulator: no clocks, so no
+            timeouts and no move times. Defaults to False.
+
+    Returns:
+        list[GameResult]: One result per game, in the order they finished
+    """
+    workers = workers or os.cpu_count() or 1
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                play_match, spec, entrants, time_per_move, reserve_time, simulate
+            )
+            for spec in schedule
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if progress:
+                print(
+                    f"[{len(results)}/{len(schedule)}] {result.red} vs {result.blue} "
+                    f"({'small' if result.small else 'large'}): {result.winner} wins"
+                    + (f", {result.loser} {result.fault}" if result.fault else "")
+                )
+    return results
+
+
+def fit_elo(
+    results: list[GameResult], names: list[str], prior: float = 1.0
+) -> dict[str, float]:
+    """
+    Fit Bradley-Terry strengths to the results and express them as Elo ratings
+    averaging 0
+
+    Args:
+        results (list[GameResult]): The games played
+        names (list[str]): Every entrant to rate
+        prior (float, optional): Virtual games, split evenly, added between every pair
+            that met, so unbeaten entrants get a finite rating. Defaults to 1.0.
+
+    Returns:
+        dict[str, float]: Elo rating per entrant
+    """
+    index = {name: i for i, name in enumerate(names)}
+    n = len(names)
+    wins = [[0.0] * n for _ in range(n)]
+    for r in results:
+        wins[index[r.winner]][index[r.loser]] += 1
+    for i in range(n):
+        for j in range(n):
+            if i != j and (wins[i][j] or wins[j][i]):
+                wins[i][j] += prior / 2
+    return _bradley_terry(wins, names)
+
+
+def _bradley_terry(wins: list[list[float]], names: list[str]) -> dict[str, float]:
+    # wins[i][j] is how many games (possibly fractional) names[i] won against names[j]
+    n = len(names)
+    games = [[wins[i][j] + wins[j][i] for j in range(n)] for i in range(n)]
+    total_wins = [sum(row) for row in wins]
+    # Minorization-maximization updates (Hunter 2004), renormalized every step
+    gamma = [1.0] * n
+    for _ in range(200):
+        new = [
+            total_wins[i]
+            / max(
+                1e-12,
+                sum(games[i][j] / (gamma[i] + gamma[j]) for j in range(n) if j != i),
+            )
+            if total_wins[i] > 0
+            else 1e-6
+            for i in range(n)
+        ]
+        scale = math.exp(sum(math.log(g) for g in new) / n)
+        gamma = [g / scale for g in new]
+    return {name: 400 * math.log10(gamma[i]) for i, name in enumerate(names)}
+
+
+def standings(
+    results: list[GameResult], bootstrap: int = 200, seed: int = 0, prior: float = 1.0
+) -> list[Standing]:
+    """
+    Summarize tournament results per entrant, strongest first
+
+    Args:
+        results (list[GameResult]): The games played
+        bootstrap (int, optional): Resamples used for the Elo confidence intervals.
+            Defaults to 200.
+        seed (int, optional): Seed for the resampling. Defaults to 0.
+        prior (float, optional): Virtual games per pairing, split evenly, for
+            fit_elo and the resampled win rates. Defaults to 1.0.
+
+    Returns:
+        list[Standing]: One row per entrant
+    """
+    names = sorted({r.red for r in results} | {r.blue for r in results})
+    elo = fit_elo(results, names, prior)
+    rng = random.Random(seed)
+    index = {name: i for i, name in enumerate(names)}
+    pairings: dict[tuple[int, int], tuple[int, int]] = {}  # (games, first one's wins)
+    for r in results:
+        a, b = sorted((index[r.red], index[r.blue]))
+        games, a_wins = pairings.get((a, b), (0, 0))
+        pairings[a, b] = (games + 1, a_wins + (index[r.winner] == a))
+    samples: dict[str, list[float]] = {name: [] for name in names}
+    for _ in range(bootstrap):
+        # Draw each pairing's win rate from its Beta posterior under the prior, and
+        # credit its games by that rate. Resampling the games themselves only ever
+        # reproduces a one-sided record, collapsing its interval to a point.
+        wins = [[0.0] * len(names) for _ in names]
+        for (a, b), (games, a_wins) in pairings.items():
+            p = rng.betavariate(a_wins + prior / 2, games - a_wins + prior / 2)
+            wins[a][b] = games * p
+            wins[b][a] = games * (1 - p)
+        for name, rating in _bradley_terry(wins, names).items():
+            samples[name].append(rating)
+    out = []
+    for name in names:
+        played = [r for r in results if name in (r.red, r.blue)]
+        wins = sum(r.winner == name for r in played)
+        seconds = sum(
+            r.red_seconds if r.red == name else r.blue_seconds for r in played
+        )
+        turns = sum(r.red_turns if r.red == name else r.blue_turns for r in played)
+        spread = sorted(samples[name])
+        out.append(
+            Standing(
+                name=name,
+                games=len(played),
+                wins=wins,
+                win_rate=wins / len(played),
+                elo=elo[name],
+                elo_low=spread[int(0.025 * len(spread))] if spread else elo[name],
+                elo_high=spread[int(0.975 * len(spread)) - 1] if spread else elo[name],
+                avg_move_time=seconds / turns if turns else 0.0,
+                timeouts=sum(
+                    r.loser == name and r.fault == "timeout" for r in played
+                ),
+                faults=sum(r.loser == name and r.fault is not None for r in played),
+            )
+        )
+    return sorted(out, key=lambda s: s.elo, reverse=True)
+
+
+def format_standings(rows: list[Standing]) -> str:
+    lines = [
+        f"{'name':<14}{'games':>6}{'wins':>6}{'win %':>7}{'elo':>7}"
+        f"{'95% CI':>15}{'s/turn':>8}{'t/o':>5}{'faults':>7}"
+    ]
+    for s in rows:
+        lines.append(
+            f"{s.name:<14}{s.games:>6}{s.wins:>6}{100 * s.win_rate:>6.1f}%"
+            f"{s.elo:>7.0f}{f'[{s.elo_low:.0f}, {s.elo_high:.0f}]':>15}"
+            f"{s.avg_move_time:>8.3f}{s.timeouts:>5}{s.faults:>7}"
+        )
+    return "\n".join(lines)
+
+
+def default_entrants() -> dict[str, PlayerFactory]:
+    from bot import bot
+    from bot2 import bot2
+    from bot3 import bot3
+    from finished_bot import finished_bot
+    from mcts_bot import MCTSPlayer
+    from random_bot import RandomPlayer
+
+    return {
+        "random": RandomPlayer,
+        "bot": bot,
+        "bot2": bot2,
+        "bot3": bot3,
+        "finished_bot": finished_bot,
+        "mcts": MCTSPlayer,
+    }
+
+
+def main():
+    entrants = default_entrants()
+    parser = argparse.ArgumentParser(description="Play bots against each other.")
+    parser.add_argument("players", nargs="*", help=f"any of {', '.join(entrants)}")
+    parser.add_argument("--games", type=int, default=2, help="per pairing, color and size")
+    parser.add_argument("--size", choices=["small", "large", "both"], default="both")
+    parser.add_argument("--gauntlet", choices=list(entrants), help="challenger to evaluate")
+    parser.add_argument("--time-per-move", type=float, default=3.0)
+    parser.add_argument("--reserve-time", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--simulate", action="store_true", help="play in-process without clocks"
+    )
+    parser.add_argument("--records", help="append every game to this binary record file")
+    args = parser.parse_args()
+
+    sizes = {"small": (True,), "large": (False,), "both": (True, False)}[args.size]
+    names = args.players or list(entrants)
+    unknown = set(names) - set(entrants)
+    if unknown:
+        parser.error(f"unknown players: {', '.join(sorted(unknown))}")
+    if args.gauntlet:
+        schedule = gauntlet(args.gauntlet, names, args.games, sizes)
+    else:
+        schedule = round_robin(names, args.games, sizes)
+    results = run_tournament(
+        entrants,
+        schedule,
+        args.time_per_move,
+        args.reserve_time,
+        args.workers,
+        progress=True,
+        simulate=args.simulate,
+    )
+    print(format_standings(standings(results)))
+    if args.records:
+        with open(args.records, "ab") as file:
+            write_binary(file, (result.record for result in results))
+
+
+if __name__ == "__main__":
+    main()
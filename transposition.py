@@ -0,0 +1,240 @@
+from array import array
+from typing import NamedTuple
+
+from board import Coordinate
+
+# Kinds of score a table entry can hold
+EXACT = 0
+LOWER = 1  # The true score is at least this (the search failed high)
+UPPER = 2  # The true score is at most this (the search failed low)
+
+# A whole turn, as in search.Turn: the dig (None if already made) and the move
+StoredTurn = tuple[Coordinate | None, tuple[Coordinate, Coordinate] | None]
+
+# Bytes used per slot: key, score, depth, bound, generation, then the turn packed as
+# one byte each for the dig and the move's start and end
+_SLOT_BYTES = 8 + 8 + 2 + 1 + 1 + 3
+# Coordinate bytes hold q + 8 and r + 8 in a nibble each, which covers every board
+# size. 0 stands for no coordinate, and a dig of _NO_TURN for no turn at all.
+_NONE = 0
+_NO_TURN = 0xFF
+
+
+class TTEntry(NamedTuple):
+    depth: int
+    score: float
+    bound: int
+    move: StoredTurn | None
+
+
+def _pack(coord: Coordinate | None) -> int:
+    if coord is None:
+        return _NONE
+    q, r = coord
+    return (q + 8) << 4 | (r + 8)
+
+
+def _unpack(byte: int) -> Coordinate | None:
+    if byte == _NONE:
+        return None
+    return (byte >> 4) - 8, (byte & 15) - 8
+
+
+def bound_for(score: float, alpha: float, beta: float) -> int:
+    """
+    Classify a search result against the window it was searched with
+
+    Args:
+        score (float): The score the search returned
+        alpha (float): The alpha the node was entered with
+        beta (float): The beta the node was entered with
+
+    Returns:
+        int: EXACT, LOWER or UPPER
+    """
+    if score <= alpha:
+        return UPPER
+    if score >= beta:
+        return LOWER
+    return EXACT
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results keyed by a 64-bit board hash.
+
+    Slots are grouped in buckets of two: the first keeps the deepest result seen for
+    the bucket in the current search, the second is always overwritten. Storage is
+    preallocated up front in flat arrays, best turns included, so memory use never
+    grows past the budget.
+    """
+
+    def __init__(self, megabytes: float = 16):
+        """
+        Create an empty table
+
+        Args:
+            megabytes (float, optional): Memory budget for the table. Defaults to 16.
+        """
+        self.buckets = max(1, int(megabytes * 2**20) // (2 * _SLOT_BYTES))
+        slots = 2 * self.buckets
+        # Repeating a one-item array allocates exactly the size asked for
+        self._keys = array("Q", [0]) * slots
+        self._scores = array("d", [0.0]) * slots
+        self._depths = array("h", [-1]) * slots
+        self._bounds = array("B", [0]) * slots
+        self._generations = array("B", [0]) * slots
+        self._digs = array("B", [_NO_TURN]) * slots
+        self._starts = array("B", [0]) * slots
+        self._ends = array("B", [0]) * slots
+        self._generation = 0
+        self.hits = 0
+        self.probes = 0
+
+    def new_search(self):
+        """
+        Mark existing entries as coming from an earlier search, so depth-preferred
+        slots holding them can be reused by the next one.
+        """
+        self._generation = (self._generation + 1) % 256
+
+    def clear(self):
+        """
+        Remove every entry from the table
+        """
+        self._depths = array("h", [-1]) * (2 * self.buckets)
+        self._digs = array("B", [_NO_TURN]) * (2 * self.buckets)
+        self.hits = self.probes = 0
+
+    def _find(self, key: int) -> int:
+        slot = 2 * (key % self.buckets)
+        if self._depths[slot] >= 0 and self._keys[slot] == key:
+            return slot
+        if self._depths[slot + 1] >= 0 and self._keys[slot + 1] == key:
+            return slot + 1
+        return -1
+
+    def probe(self, key: int) -> TTEntry | None:
+        """
+        Look up the stored result for a position
+
+        Args:
+            key (int): 64-bit hash of the position, including anything else the score
+                depends on (side to move, search type, ...)
+
+        Returns:
+            TTEntry | None: The stored entry, or None if there isn't one
+        """
+        self.probes += 1
+        slot = self._find(key)
+        if slot < 0:
+            return None
+        self.hits += 1
+        return TTEntry(
+            self._depths[slot], self._scores[slot], self._bounds[slot], self._turn(slot)
+        )
+
+    def lookup(
+        self, key: int, depth: int, alpha: float, beta: float
+    ) -> tuple[float | None, StoredTurn | None]:
+        """
+        Probe the table from inside an alpha-beta search
+
+        Args:
+            key (int): 64-bit hash of the position
+            depth (int): Remaining depth the caller is about to search
+            alpha (float): The caller's alpha
+            beta (float): The caller's beta
+
+        Returns:
+            tuple[float | None, StoredTurn | None]: A score the caller can return
+                immediately (None if the entry is missing, too shallow or doesn't cause
+                a cutoff) and the stored best turn, if any, to try first
+        """
+        entry = self.probe(key)
+        if entry is None:
+            return None, None
+        if entry.depth >= depth:
+            if entry.bound == EXACT:
+                return entry.score, entry.move
+            if entry.bound == LOWER and entry.score >= beta:
+                return entry.score, entry.move
+            if entry.bound == UPPER and entry.score <= alpha:
+                return entry.score, entry.move
+        return None, entry.move
+
+    def store(
+        self,
+        key: int,
+        depth: int,
+        score: float,
+        bound: int,
+        move: StoredTurn | None = None,
+    ):
+        """
+        Save a search result, evicting according to the bucket's replacement policy
+
+        Args:
+            key (int): 64-bit hash of the position
+            depth (int): Remaining depth the position was searched to
+            score (float): The score found
+            bound (int): EXACT, LOWER or UPPER
+            move (StoredTurn | None, optional): The best turn found. Defaults to None.
+        """
+        slot = 2 * (key % self.buckets)
+        same = self._depths[slot] >= 0 and self._keys[slot] == key
+        if (
+            same
+            or depth >= self._depths[slot]
+            or self._generations[slot] != self._generation
+        ):
+            if not same and self._depths[slot] >= 0:
+                # Demote the old deep entry instead of throwing it away
+                self._write(slot + 1, *self._read(slot))
+            if same and move is None:
+                move = self._turn(slot)
+        else:
+            slot += 1
+        self._write(slot, key, depth, score, bound, move)
+
+    def _turn(self, slot: int) -> StoredTurn | None:
+        dig = self._digs[slot]
+        if dig == _NO_TURN:
+            return None
+        start = _unpack(self._starts[slot])
+        move = None if start is None else (start, _unpack(self._ends[slot]))
+        return _unpack(dig), move
+
+    def _read(self, slot: int) -> tuple[int, int, float, int, StoredTurn | None]:
+        return (
+            self._keys[slot],
+            self._depths[slot],
+            self._scores[slot],
+            self._bounds[slot],
+            self._turn(slot),
+        )
+
+    def _write(
+        self,
+        slot: int,
+        key: int,
+        depth: int,
+        score: float,
+        bound: int,
+        move: StoredTurn | None,
+    ):
+        self._keys[slot] = key
+        self._depths[slot] = depth
+        self._scores[slot] = score
+        self._bounds[slot] = bound
+        self._generations[slot] = self._generation
+        if move is None:
+            self._digs[slot] = _NO_TURN
+            return
+        dig, step = move
+        self._digs[slot] = _pack(dig)
+        self._starts[slot] = _pack(step[0]) if step is not None else _NONE
+        self._ends[slot] = _pack(step[1]) if step is not None else _NONE
+
+    def __len__(self) -> int:
+        return len(self._depths) - self._depths.count(-1)
@@ -0,0 +1,195 @@
+import multiprocessing
+import time
+import traceback
+from multiprocessing import util
+from multiprocessing.connection import Connection
+from typing import Any
+
+# Extra seconds allowed for pickling and the pipe on top of a call's time limit.
+# Only the time measured inside the worker is charged to the player.
+TRANSPORT_GRACE = 0.5
+# Seconds a search helper may run past its deadline, for the work it was in the
+# middle of when the deadline passed
+HELPER_SLACK = 0.1
+
+
+class PlayerCrashed(Exception):
+    """
+    The player raised an exception. The message is the traceback from the worker.
+    """
+
+
+def _serve(player: Any, conn: Connection):
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        method, args, context = message
+        # begin_turn is part of the call, so its time is charged to the player too
+        start = time.monotonic()
+        try:
+            if context is not None and hasattr(player, "begin_turn"):
+                player.begin_turn(context)
+            result = getattr(player, method)(*args)
+            elapsed = time.monotonic() - start
+        except Exception:
+            conn.send((False, traceback.format_exc(), 0.0))
+        else:
+            conn.send((True, result, elapsed))
+
+
+def _stop(process: multiprocessing.Process, conn: Connection):
+    if process.is_alive():
+        try:
+            conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        process.join(1.0)
+    process.kill()
+    process.join()
+    conn.close()
+
+
+class PlayerWorker:
+    """
+    A long-lived process holding its own copy of a player. Calls are sent over a pipe,
+    so the player keeps its state (tables, plans, caches) from one turn to the next.
+    A call that runs past its time limit gets the process killed and replaced by a
+    fresh copy of the original player.
+
+    Workers are not daemonic, so players may start workers of their own (e.g. for a
+    parallel search). Any still running are closed when the starting process exits.
+    """
+
+    def __init__(self, player: Any):
+        """
+        Args:
+            player (Any): The player to run. Copied into the worker when it starts.
+        """
+        self.player = player
+        self._process: multiprocessing.Process | None = None
+        self._conn: Connection | None = None
+        self._finalizer: util.Finalize | None = None
+        self._pending: str | None = None
+
+    def start(self):
+        """
+        Start the worker process if it isn't already running
+        """
+        if self._process is not None and self._process.is_alive():
+            return
+        self.kill()
+        self._conn, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(self.player, child)
+        )
+        self._process.start()
+        child.close()
+        # Runs before multiprocessing joins its children at exit, which would
+        # otherwise wait forever on a worker still waiting for calls
+        self._finalizer = util.Finalize(
+            self, _stop, args=(self._process, self._conn), exitpriority=10
+        )
+
+    def call(
+        self, method: str, args: tuple, timeout: float, context: Any = None
+    ) -> tuple[Any, float]:
+        """
+        Run one of the player's methods in the worker
+
+        Args:
+            method (str): Name of the method to call, e.g. "mine"
+            args (tuple): Positional arguments for the method
+            timeout (float): Seconds the method may run for
+            context (Any, optional): Passed to the player's begin_turn first, if it
+                has one. Defaults to None.
+
+        Raises:
+            TimeoutError: The call ran longer than the timeout
+            PlayerCrashed: The method raised an exception, or the worker process died
+
+        Returns:
+            tuple[Any, float]: The method's return value and the seconds it took,
+                measured inside the worker
+        """
+        self.submit(method, args, context)
+        result, elapsed = self.result(timeout)
+        if elapsed > timeout:
+            raise TimeoutError(f"{method} took {elapsed:.3f}s of {timeout:.3f}s")
+        return result, elapsed
+
+    def submit(self, method: str, args: tuple, context: Any = None):
+        """
+        Start running one of the player's methods in the worker without waiting for
+        it, so several workers can run at once. Collect the answer with result().
+
+        Args:
+            method (str): Name of the method to call
+            args (tuple): Positional arguments for the method
+            context (Any, optional): Passed to the player's begin_turn first, if it
+                has one. Defaults to None.
+        """
+        self.start()
+        self._conn.send((method, args, context))
+        self._pending = method
+
+    def result(self, timeout: float | None) -> tuple[Any, float]:
+        """
+        Wait for the call started by submit(). Only the wait is limited, so a call
+        submitted earlier may have run longer than the timeout in total.
+
+        Args:
+            timeout (float | None): Seconds to wait for the answer, counted from now,
+                or None to wait as long as it takes
+
+        Raises:
+            TimeoutError: No answer came in time. The worker is killed.
+            PlayerCrashed: The method raised an exception, or the worker process died
+
+        Returns:
+            tuple[Any, float]: The method's return value and the seconds it took,
+                measured inside the worker
+        """
+        method, self._pending = self._pending, None
+        try:
+            answered = timeout is None or self._conn.poll(timeout + TRANSPORT_GRACE)
+            message = self._conn.recv() if answered else None
+        except (EOFError, OSError) as e:
+            # The process died (os._exit, a signal, running out of memory, ...)
+            self._process.join(1.0)
+            exitcode = self._process.exitcode
+            self.kill()
+            raise PlayerCrashed(
+                f"Worker process died during {method} (exit code {exitcode})"
+            ) from e
+        if message is None:
+            self.kill()
+            raise TimeoutError(f"{method} took longer than {timeout:.3f}s")
+        ok, result, elapsed = message
+        if not ok:
+            raise PlayerCrashed(result)
+        return result, elapsed
+
+    def kill(self):
+        """
+        Stop the worker immediately. The next call starts a fresh one.
+        """
+        if self._finalizer is not None:
+            self._finalizer.cancel()
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+        if self._conn is not None:
+            self._conn.close()
+        self._process = self._conn = self._finalizer = None
+
+    def close(self):
+        """
+        Ask the worker to exit, killing it if it doesn't
+        """
+        if self._finalizer is not None:
+            self._finalizer()
+        self._process = self._conn = self._finalizer = None